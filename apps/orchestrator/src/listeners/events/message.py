@@ -106,6 +106,9 @@ def handle_message(event: dict, say: Say, client: WebClient, logger: Logger) ->
         # Set TTL on messages (24 hours)
         redis_client.expire(messages_key, 86400)
 
+        # Wake a dog blocked in wait_for_response
+        redis_client.publish(f"dogwalker:thread_notify:{thread_ts}", message_ts or "1")
+
         logger.info(
             f"Stored message from {user_name} in thread {thread_ts} "
             f"for task {task_id}: '{text[:50]}...'"
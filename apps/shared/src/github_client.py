@@ -1,11 +1,17 @@
 """GitHub API client for Dogwalker."""
 
+import base64
+from pathlib import Path
 from typing import Optional
-from github import Github, GithubException
+from github import Github, GithubException, InputGitTreeElement
 import logging
+import requests
 
 logger = logging.getLogger(__name__)
 
+# Dedicated branch that holds uploaded screenshots and images
+SCREENSHOTS_BRANCH = "dogwalker-screenshots"
+
 
 class GitHubClient:
     """Wrapper for GitHub API operations."""
@@ -22,6 +28,18 @@ class GitHubClient:
         self.github = Github(token)
         self.repo_name = repo_name
         self._repo = None
+        self._http_session: Optional[requests.Session] = None
+        # Last invitations response, revalidated with If-None-Match (304s are free of rate limit)
+        self._invitations_etag: Optional[str] = None
+        self._invitations: list[dict] = []
+
+    @property
+    def http(self) -> requests.Session:
+        """Authenticated requests.Session for raw REST calls (keeps connections alive)."""
+        if self._http_session is None:
+            self._http_session = requests.Session()
+            self._http_session.headers["Authorization"] = f"token {self.token}"
+        return self._http_session
 
     @property
     def repo(self):
@@ -175,11 +193,8 @@ class GitHubClient:
 
             if pr_node_id:
                 # Execute GraphQL mutation
-                headers = {"Authorization": f"token {self.token}"}
-                import requests
-                response = requests.post(
+                response = self.http.post(
                     "https://api.github.com/graphql",
-                    headers=headers,
                     json={
                         "query": mutation,
                         "variables": {"pullRequestId": pr_node_id}
@@ -247,8 +262,6 @@ class GitHubClient:
             Permanent GitHub blob URL, or None on failure
         """
         try:
-            from pathlib import Path
-
             image_file = Path(image_path)
             if not image_file.exists():
                 logger.error(f"Image file not found: {image_path}")
@@ -258,26 +271,12 @@ class GitHubClient:
             with open(image_file, 'rb') as f:
                 image_data = f.read()
 
-            screenshots_branch = "dogwalker-screenshots"
+            screenshots_branch = SCREENSHOTS_BRANCH
             screenshot_path = screenshot_filename  # Store in root of screenshots branch
 
             # Check if screenshots branch exists, create if not
-            try:
-                branch = self.repo.get_branch(screenshots_branch)
-                logger.info(f"✅ Screenshots branch '{screenshots_branch}' exists (SHA: {branch.commit.sha[:7]})")
-            except GithubException as e:
-                # Create screenshots branch from default branch
-                logger.info(f"📝 Creating screenshots branch '{screenshots_branch}' (branch not found)")
-                try:
-                    default_branch = self.repo.get_branch(self.repo.default_branch)
-                    self.repo.create_git_ref(
-                        ref=f"refs/heads/{screenshots_branch}",
-                        sha=default_branch.commit.sha
-                    )
-                    logger.info(f"✅ Created screenshots branch '{screenshots_branch}'")
-                except GithubException as create_error:
-                    logger.error(f"❌ Failed to create screenshots branch: {create_error.status} - {create_error.data}")
-                    return None
+            if self._ensure_screenshots_branch() is None:
+                return None
 
             # Upload image to screenshots branch
             # Extract and log extension to verify it's preserved
@@ -325,6 +324,100 @@ class GitHubClient:
             logger.exception(f"Failed to upload image to GitHub: {e}")
             return None
 
+    def upload_images_to_github(self, images: list[tuple[str, str]]) -> dict[str, str]:
+        """
+        Upload several images to the GitHub screenshots branch in a single commit.
+
+        Creates one blob per image, then one tree and commit on top of the branch,
+        instead of an existence check plus a Contents API commit per image. The
+        returned URLs are pinned to that commit, so later uploads reusing the same
+        filenames don't change images already linked from a PR.
+
+        Args:
+            images: (image_path, screenshot_filename) pairs
+
+        Returns:
+            screenshot_filename -> permanent GitHub blob URL for each uploaded image
+            (empty on failure)
+        """
+        if not images:
+            return {}
+
+        try:
+            if self._ensure_screenshots_branch() is None:
+                return {}
+
+            # Blobs don't depend on the branch head, so they're created once even if the commit is retried
+            elements = []
+            filenames = []
+            for image_path, screenshot_filename in images:
+                image_file = Path(image_path)
+                if not image_file.exists():
+                    logger.error(f"Image file not found: {image_path}")
+                    continue
+                blob = self.repo.create_git_blob(base64.b64encode(image_file.read_bytes()).decode("ascii"), "base64")
+                elements.append(InputGitTreeElement(path=screenshot_filename, mode="100644", type="blob", sha=blob.sha))
+                filenames.append(screenshot_filename)
+
+            if not elements:
+                return {}
+
+            logger.info(f"📤 Uploading {len(elements)} image(s) to branch '{SCREENSHOTS_BRANCH}' in one commit...")
+            ref = self.repo.get_git_ref(f"heads/{SCREENSHOTS_BRANCH}")
+            for attempt in range(3):
+                parent = self.repo.get_git_commit(ref.object.sha)
+                tree = self.repo.create_git_tree(elements, base_tree=parent.tree)
+                commit = self.repo.create_git_commit(f"Add {len(elements)} screenshot(s)", tree, [parent])
+                try:
+                    ref.edit(commit.sha)
+                    break
+                except GithubException as e:
+                    # Branch moved (another upload landed first) - rebuild on the new head
+                    if e.status != 422 or attempt == 2:
+                        raise
+                    logger.info(f"Screenshots branch moved, retrying commit (attempt {attempt + 2}/3)...")
+                    ref = self.repo.get_git_ref(f"heads/{SCREENSHOTS_BRANCH}")
+
+            logger.info(f"✅ Uploaded {len(elements)} image(s) to GitHub (commit: {commit.sha[:7]})")
+            # Blob URL with ?raw=true (works for private repos in PR descriptions)
+            return {
+                filename: f"https://github.com/{self.repo_name}/blob/{commit.sha}/{filename}?raw=true"
+                for filename in filenames
+            }
+
+        except GithubException as e:
+            logger.error(f"❌ Failed to upload images to GitHub: {e.status} - {e.data}")
+            return {}
+        except Exception as e:
+            logger.exception(f"Failed to upload images to GitHub: {e}")
+            return {}
+
+    def _ensure_screenshots_branch(self):
+        """
+        Get the screenshots branch, creating it from the default branch if needed.
+
+        Returns:
+            Branch object, or None if it doesn't exist and couldn't be created
+        """
+        try:
+            branch = self.repo.get_branch(SCREENSHOTS_BRANCH)
+            logger.info(f"✅ Screenshots branch '{SCREENSHOTS_BRANCH}' exists (SHA: {branch.commit.sha[:7]})")
+            return branch
+        except GithubException:
+            # Create screenshots branch from default branch
+            logger.info(f"📝 Creating screenshots branch '{SCREENSHOTS_BRANCH}' (branch not found)")
+            try:
+                default_branch = self.repo.get_branch(self.repo.default_branch)
+                self.repo.create_git_ref(
+                    ref=f"refs/heads/{SCREENSHOTS_BRANCH}",
+                    sha=default_branch.commit.sha
+                )
+                logger.info(f"✅ Created screenshots branch '{SCREENSHOTS_BRANCH}'")
+                return self.repo.get_branch(SCREENSHOTS_BRANCH)
+            except GithubException as create_error:
+                logger.error(f"❌ Failed to create screenshots branch: {create_error.status} - {create_error.data}")
+                return None
+
     def get_pending_invitations(self) -> list[dict]:
         """
         Get pending repository collaboration invitations for the authenticated user.
@@ -337,16 +430,20 @@ class GitHubClient:
                 - created_at: Invitation timestamp
         """
         try:
-            import requests
-
-            headers = {"Authorization": f"token {self.token}"}
-            response = requests.get(
+            headers = {"If-None-Match": self._invitations_etag} if self._invitations_etag else {}
+            response = self.http.get(
                 "https://api.github.com/user/repository_invitations",
                 headers=headers
             )
 
-            if response.status_code == 200:
+            if response.status_code == 304:
+                # Unchanged since the last check (e.g., an acceptance that failed)
+                logger.debug(f"Pending invitations unchanged ({len(self._invitations)})")
+                return self._invitations
+            elif response.status_code == 200:
                 invitations = response.json()
+                self._invitations_etag = response.headers.get("ETag")
+                self._invitations = invitations
                 logger.debug(f"Found {len(invitations)} pending invitation(s)")
                 return invitations
             elif response.status_code == 401:
@@ -374,12 +471,8 @@ class GitHubClient:
             True if invitation was accepted successfully, False otherwise
         """
         try:
-            import requests
-
-            headers = {"Authorization": f"token {self.token}"}
-            response = requests.patch(
-                f"https://api.github.com/user/repository_invitations/{invitation_id}",
-                headers=headers
+            response = self.http.patch(
+                f"https://api.github.com/user/repository_invitations/{invitation_id}"
             )
 
             if response.status_code == 204:
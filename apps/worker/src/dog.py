@@ -1,15 +1,464 @@
 """Dog worker - AI coding agent using Aider."""
 
+import asyncio
+import functools
+import hashlib
+import itertools
+import json
 import logging
+import os
+import re
+import shutil
+import string
+import subprocess
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Final, Iterator, NamedTuple
 from aider.coders import Coder
 from aider.models import Model
 from aider.io import InputOutput
-import os
+from aider.repo import GitRepo
+from anthropic import Anthropic
+
+from prompt_cache import PromptCache
+from screenshot_tools import ShotInfo
+
+try:
+    import pygit2
+except ImportError:
+    # Optional: without libgit2 bindings, git queries fall back to the git CLI
+    pygit2 = None
 
 logger = logging.getLogger(__name__)
 
+# Prompt caching price multipliers, relative to the base input token price
+CACHE_READ_MULTIPLIER = 0.1
+CACHE_WRITE_MULTIPLIER = 1.25
+
+# Tasks containing this marker bypass the LLM response cache (see strip_skip_cache_marker)
+SKIP_CACHE_MARKER = "!skip-cache"
+
+# Prompts above this many tokens are refused before sending (leaves output headroom
+# in the 200k context window); a token is rarely under 2 characters, so shorter
+# prompts skip the count entirely
+MAX_PROMPT_TOKENS = 150_000
+MIN_CHARS_PER_TOKEN = 2
+
+# Token budget for web + search context in an Aider task prompt (repo map and chat need the rest)
+MAX_TASK_CONTEXT_TOKENS = 50_000
+
+# Faster, cheaper model for short classification/summarization meta-calls. Only the
+# standalone title and search-analysis calls use it - those run when the batched task
+# prep is skipped or misses an answer. The batch itself also writes the plan, which
+# stays on the Dog's model, so title and searches ride along there
+FAST_META_MODEL = "anthropic/claude-3-5-haiku-20241022"
+
+# Word-set similarity to a cached task above which its PR title is passed to the
+# model as an exemplar to adapt (word sets ignore order and negation, so the
+# title is never reused without a model call)
+TITLE_EXEMPLAR_SIMILARITY = 0.6
+
+# Leading verbs of short requests that already read as PR titles ("Fix login redirect")
+TITLE_IMPERATIVE_VERBS = frozenset({
+    "add", "bump", "change", "clean", "convert", "create", "delete", "disable",
+    "document", "drop", "enable", "extract", "fix", "handle", "implement",
+    "improve", "make", "migrate", "move", "optimize", "refactor", "remove",
+    "rename", "replace", "revert", "show", "simplify", "support", "update",
+    "upgrade", "use",
+})
+
+# Static instructions for the task prep prompts. They come first and are marked
+# for Anthropic prompt caching; only the trailing task description varies.
+_TITLE_PROMPT_STATIC = """Create a concise, descriptive pull request title that summarizes the task given at the end.
+
+Requirements:
+- Maximum {max_length} characters
+- Use imperative mood (e.g., "Add feature" not "Adds feature" or "Added feature")
+- Be specific about what changed
+- No punctuation at the end
+- Use title case for first word only
+
+Examples:
+- "Add rate limiting to login endpoint"
+- "Fix authentication token expiration"
+- "Refactor user service for better testability"
+- "Update Node.js dependencies to latest versions"
+
+Provide ONLY the title text in your response. No explanation, no quotes, no additional text."""
+
+_PLAN_PROMPT_STATIC = """Create an implementation plan for the task given at the end.
+
+Format your response as a clean, structured markdown plan with these sections:
+
+**Architecture**
+- List components/services/modules that will be affected
+
+**Files to Modify/Create**
+- List specific files
+
+**Implementation Approach**
+- High-level steps to solve the problem
+- Any breaking changes or migrations needed
+
+**Commit Strategy**
+- Break into commits of ≤500 LOC each
+- List commits in order
+
+CRITICAL RULES:
+- Provide ONLY the structured plan above
+- NO conversational text (no "Perfect!", "Let's start", etc.)
+- NO code snippets or file contents
+- NO commands (no mkdir, npm install, etc.)
+- Just clean markdown bullets describing WHAT will be done, not HOW
+
+Keep the entire plan under 250 words."""
+
+_SEARCH_ANALYSIS_STATIC = """Analyze the coding task given at the end and determine if internet searches are CRITICAL.
+
+IMPORTANT: Searches consume significant tokens and time. ONLY search if ABSOLUTELY CRITICAL.
+
+Only search if the task requires:
+- **Breaking API changes** - New API endpoints or changed syntax you don't know
+- **Version-specific bugs** - Known issues in specific library versions
+- **External service specs** - Third-party API requirements not in codebase
+
+DO NOT search for:
+- ❌ Design patterns (use existing codebase patterns)
+- ❌ Best practices (follow existing code style)
+- ❌ General examples (read similar code in repo)
+- ❌ UI/UX patterns (user provided requirements/images)
+- ❌ Common tasks you know how to do
+
+Default answer: "NONE"
+
+Only if truly critical and you cannot proceed without external docs, provide 1-2 specific queries (one per line).
+
+Provide ONLY "NONE" or the queries, no explanations."""
+
+# Cheap local pre-check for the search criteria above: tasks that mention none of
+# these almost always get "NONE", so the search analysis is skipped for them
+_SEARCH_TRIGGER_RE = re.compile(
+    r"\b(api|endpoint|version|migration|deprecated|upgrade|oauth|webhook|sdk|spec|rfc|breaking change)\b",
+    re.IGNORECASE,
+)
+
+
+def _task_as_title(task_description: str, max_length: int) -> Optional[str]:
+    """
+    Use a task description as its own PR title when it already reads like one.
+
+    Args:
+        task_description: Natural language description of code changes
+        max_length: Maximum length for the title
+
+    Returns:
+        The description as a title (capitalized, no trailing period), or None if
+        it's too long, multi-line, or doesn't start with a known imperative verb
+    """
+    title = task_description.strip().rstrip(".").strip()
+    words = title.split()
+    if (
+        len(words) < 2
+        or len(title) > max_length
+        or "\n" in title
+        or words[0].lower() not in TITLE_IMPERATIVE_VERBS
+    ):
+        return None
+    return title[0].upper() + title[1:]
+
+
+def strip_skip_cache_marker(task_description: str) -> tuple[str, bool]:
+    """
+    Remove SKIP_CACHE_MARKER from a task so it never reaches prompts, titles, or PRs.
+
+    Args:
+        task_description: Task text as submitted
+
+    Returns:
+        Tuple of (task text without the marker, whether the marker was present)
+    """
+    if SKIP_CACHE_MARKER not in task_description:
+        return task_description, False
+    return re.sub(rf"[ \t]*{re.escape(SKIP_CACHE_MARKER)}", "", task_description).strip(), True
+
+
+def truncate_title(title: str, max_length: int) -> str:
+    """
+    Cut a title to max_length, preferring to break at the last word boundary.
+
+    Falls back to a hard cut when the last space would drop more than half the
+    allowed length (e.g., a long unbroken word after a short first word).
+
+    Args:
+        title: Title text
+        max_length: Maximum length
+
+    Returns:
+        The title unchanged if it fits, otherwise a prefix of at most max_length chars
+    """
+    if len(title) <= max_length:
+        return title
+    title = title[:max_length]
+    space = title.rfind(" ")
+    return title if space < max_length // 2 else title[:space]
+
+
+@functools.lru_cache(maxsize=None)
+def _title_prompt_static(max_length: int) -> str:
+    """Title instructions formatted for max_length (built once per length; in practice only 57)."""
+    return _TITLE_PROMPT_STATIC.format(max_length=max_length)
+
+
+@functools.lru_cache(maxsize=None)
+def _batch_prompt_static(max_length: int, ask_title: bool, ask_searches: bool) -> str:
+    """
+    Build the instructions for the batched title/search/plan request.
+
+    Every question refers to the task given at the end, so all of the
+    instructions form one static (cacheable) prefix. Built once per variant.
+    The plan is always asked last so the plan's stop sequence can end the
+    response right after it.
+
+    Args:
+        max_length: Maximum length for the PR title
+        ask_title: Whether to include the PR title question
+        ask_searches: Whether to include the search-analysis question
+
+    Returns:
+        Static prompt text
+    """
+    questions = []
+    if ask_title:
+        questions.append(("pr_title", _title_prompt_static(max_length)))
+    if ask_searches:
+        questions.append(("searches", _SEARCH_ANALYSIS_STATIC))
+    questions.append(("plan", _PLAN_PROMPT_STATIC))
+
+    batch_static = f"""Answer the following {len(questions)} questions about the coding task given at the end. Follow each question's own instructions for its answer.
+"""
+    for number, (_, instructions) in enumerate(questions, 1):
+        batch_static += f"""
+[Q{number}]
+{instructions}
+"""
+    envelope = "".join(f"<{tag}>Q{number} answer</{tag}>" for number, (tag, _) in enumerate(questions, 1))
+    batch_static += f"""
+Respond with ONLY this envelope, each answer inside its tag:
+<answers>{envelope}</answers>"""
+    return batch_static
+
+
+def _cached_prefix_prompt(static_text: str, task_description: str) -> list[dict[str, Any]]:
+    """
+    Build message content with a prompt-cached static prefix followed by the task.
+
+    Args:
+        static_text: Instructions that are identical across tasks
+        task_description: The task the instructions apply to
+
+    Returns:
+        Content blocks for a user message
+    """
+    return [
+        {"type": "text", "text": static_text, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": f'Task: "{task_description}"'},
+    ]
+
+# Static closing instructions for the PR description prompts (the dynamic context is prepended)
+_DRAFT_PR_PROMPT_FOOT = """
+End with:
+---
+🚧 **This is a draft PR** - Implementation in progress...
+
+_This PR will be updated with changes and marked ready for review when complete._
+
+---
+🤖 Generated with [Dogwalker AI](https://dogwalker.dev)
+
+Provide ONLY the markdown PR description. No explanations, no additional text."""
+
+_FINAL_PR_PROMPT_FOOT = """
+End with:
+---
+🤖 Generated with [Dogwalker AI](https://dogwalker.dev)
+
+Co-Authored-By: Claude <noreply@anthropic.com>
+
+Provide ONLY the markdown PR description. Be professional and concise."""
+
+# Fallback PR description bodies, used when the Claude API call fails
+_DRAFT_PR_FALLBACK = string.Template("""## 🐕 Dogwalker AI Task Report
+
+### 👤 Requester
+**${requester_name}** requested this change
+
+### 📋 Request
+> ${task_description}
+
+${image_markdown}
+
+### 📅 When
+Requested on **${request_time_str}**
+
+### 🎯 Implementation Plan
+${plan}
+
+---
+
+🚧 **This is a draft PR** - Implementation in progress...
+
+_This PR will be updated with changes and marked ready for review when complete._
+
+---
+🤖 Generated with [Dogwalker AI](https://dogwalker.dev)""")
+
+_FINAL_PR_FALLBACK = string.Template("""## 🐕 Dogwalker AI Task Report
+
+### 👤 Requester
+**${requester_name}** requested this change
+
+### 📋 Request
+> ${task_description}
+
+${image_markdown}
+
+### 📅 When
+Requested on **${request_time_str}**
+
+### 🎯 Implementation Plan
+${plan}
+
+### 📝 Changes Made
+${files_list}
+${screenshots_section}${thread_feedback_section}${critical_section}
+
+### ✅ Quality Assurance
+This PR has been:
+- Self-reviewed by the AI agent
+- Comprehensive tests written and verified passing
+- All code changes validated before submission
+
+### ⏱️ Task Duration
+Completed in **${duration_str}**
+${cost_section}
+
+---
+🤖 Generated with [Dogwalker AI](https://dogwalker.dev)
+
+Co-Authored-By: Claude <noreply@anthropic.com>""")
+
+
+@dataclass(slots=True)
+class CostBreakdown:
+    """API cost per task phase, with a fallback dict for ad-hoc categories."""
+
+    task_prep_batch: float = 0.0
+    pr_title: float = 0.0
+    plan_generation: float = 0.0
+    draft_pr_description: float = 0.0
+    implementation: float = 0.0
+    self_review: float = 0.0
+    testing: float = 0.0
+    critical_review: float = 0.0
+    final_pr_description: float = 0.0
+    other: defaultdict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+    def add(self, category: str, cost: float) -> None:
+        """Add cost to a known phase slot, or to the fallback dict for unknown categories."""
+        if category in _COST_CATEGORIES:
+            setattr(self, category, getattr(self, category) + cost)
+        else:
+            self.other[category] += cost
+
+    def to_dict(self) -> dict[str, float]:
+        """Flatten into a single category -> cost mapping (known phases first)."""
+        # Not dataclasses.asdict: it can't rebuild the defaultdict field
+        breakdown = {category: getattr(self, category) for category in _COST_CATEGORY_ORDER}
+        breakdown.update(self.other)
+        return breakdown
+
+
+_COST_CATEGORY_ORDER = tuple(f.name for f in fields(CostBreakdown) if f.name != "other")
+_COST_CATEGORIES = frozenset(_COST_CATEGORY_ORDER)
+
+
+# Top-level files that mark a Python project
+PYTHON_PROJECT_MARKERS = frozenset({"setup.py", "pyproject.toml", "requirements.txt"})
+
+# Where to look for tsconfig.json, relative to the repo root (root first, then common monorepo layouts)
+TSCONFIG_DIRS = ("", "apps/frontend", "packages/frontend")
+
+# Cap on recently changed files handed to Aider for review/testing
+MAX_REVIEW_FILES = 200
+
+# Cap on the recent-commit diff included in the compilation-hang fix prompt
+MAX_HANG_DIFF_CHARS = 20000
+
+# Code that typically hangs page compilation: endless loops and effects. Imports are
+# left out - every file has many, so they'd crowd out the per-file cap (import cycles
+# show up in the suspect diff instead)
+HANG_SUSPECT_PATTERNS = (r"while\s*\(\s*true", r"for\s*\(\s*;\s*;", r"useEffect\(")
+HANG_SUSPECT_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+MAX_HANG_SNIPPETS_PER_FILE = 10
+MAX_HANG_SNIPPETS = 200
+
+# Lockfiles fingerprinted to decide whether node_modules needs reinstalling
+NODE_LOCKFILES = ("package-lock.json", "yarn.lock", "pnpm-lock.yaml")
+
+# Changes hot reload doesn't pick up: dependencies, build config, and env files
+DEV_SERVER_RESTART_FILE_RE = re.compile(
+    r"(^|/)(package\.json|package-lock\.json|yarn\.lock|pnpm-lock\.yaml|tsconfig\.json"
+    r"|(next|vite|webpack|postcss|tailwind|babel)\.config\.\w+|\.babelrc|\.env(\.[\w.-]+)?)$"
+)
+
+# Sent to Aider when the dev server hangs compiling pages for the after screenshots.
+# Kept byte-identical across retries so the provider's prompt cache can match it.
+_COMPILATION_HANG_FIX_PROMPT: Final[str] = """
+The dev server is stuck during page compilation (>30s with no progress). This indicates a code bug.
+
+Common causes and how to fix them:
+
+1. **Infinite loops during render/SSR** - Code running during component render or module-level execution that never completes
+   - Check for while(true) loops without breaks
+   - Look for recursive function calls without base cases
+   - Check useEffect hooks with incorrect dependencies causing infinite re-renders
+
+2. **Circular dependencies** - Modules importing each other in a loop
+   - Review import statements in recently changed files
+   - Break circular imports by moving shared code to separate modules
+   - Use dynamic imports for circular references
+
+3. **Heavy computation during module load** - Expensive operations running at import time
+   - Move computations inside functions or useEffect
+   - Defer heavy processing until after component mounts
+   - Use lazy loading for expensive modules
+
+4. **Syntax errors causing infinite compilation loops** - Malformed code that confuses the compiler
+   - Check for unclosed brackets, parentheses, or quotes
+   - Verify template literal syntax
+   - Check for missing semicolons or commas
+
+Please analyze the recently changed files and fix any code that could cause compilation to hang.
+Focus on files modified in the last few commits - those are the most likely culprits.
+
+After fixing, ensure the code compiles successfully.
+"""
+
+
+class ValidationJob(NamedTuple):
+    """A compile/type-check command run by Dog._validate_changes_compile."""
+
+    description: str
+    command: list[str]
+    cwd: Path
+    timeout: int
+    missing_markers: tuple[str, ...]  # Lowercase stderr text meaning "tool not installed"
+
 
 class Dog:
     """AI coding agent that uses Aider to make code changes."""
@@ -20,6 +469,13 @@ class Dog:
         "claude-3-5-sonnet-20241022": {"input": 3.00, "output": 15.00},
         "claude-3-5-haiku-20241022": {"input": 0.80, "output": 4.00},
     }
+    DEFAULT_PRICING_MODEL = "claude-sonnet-4-20250514"
+
+    # Same pricing as (input, output) dollars per token, for the per-call cost math
+    _PRICING_PER_TOKEN = {
+        name: (pricing["input"] / 1_000_000, pricing["output"] / 1_000_000)
+        for name, pricing in MODEL_PRICING.items()
+    }
 
     def __init__(
         self,
@@ -28,7 +484,8 @@ class Dog:
         map_tokens: int = 512,  # Reduced from 1024 to leave headroom for web/search context
         communication: Optional[Any] = None,  # DogCommunication instance for bi-directional Slack
         search_tools: Optional[Any] = None,  # SearchTools instance for proactive web searching
-        screenshot_tools: Optional[Any] = None  # ScreenshotTools instance for before/after screenshots
+        screenshot_tools: Optional[Any] = None,  # ScreenshotTools instance for before/after screenshots
+        skip_cache: bool = False  # Task opted out of the LLM response cache (see strip_skip_cache_marker)
     ):
         """
         Initialize Dog with Aider.
@@ -40,105 +497,294 @@ class Dog:
             communication: DogCommunication instance for Slack interaction (optional)
             search_tools: SearchTools instance for internet searching (optional)
             screenshot_tools: ScreenshotTools instance for visual documentation (optional)
+            skip_cache: Bypass the LLM response cache for this task (default: False)
         """
         self.repo_path = repo_path
+        self._repo_prefix = f"{repo_path}{os.sep}"  # For cheap repo-relative path stripping
         self.model_name = model_name
         self.map_tokens = map_tokens
         self.coder: Optional[Coder] = None
+        # run_task's Coder, kept across implementation/feedback rounds so its repo
+        # map, chat history and provider prompt cache stay warm
+        self._task_coder: Optional[Coder] = None
         self.communication = communication  # Bi-directional Slack communication
         self.search_tools = search_tools  # Internet search capabilities
         self.screenshot_tools = screenshot_tools  # Before/after screenshot capabilities
 
-        # Cost tracking
-        self.total_cost = 0.0
-        self.cost_breakdown = {
-            "pr_title": 0.0,
-            "plan_generation": 0.0,
-            "draft_pr_description": 0.0,
-            "implementation": 0.0,
-            "self_review": 0.0,
-            "testing": 0.0,
-            "critical_review": 0.0,
-            "final_pr_description": 0.0,
-        }
+        # Anthropic SDK doesn't need the "anthropic/" provider prefix Aider uses
+        self._model_short = self.model_name.replace("anthropic/", "")
+        # Model is fixed per Dog, so resolve its per-token pricing once
+        self._input_per_token, self._output_per_token = self._per_token_pricing(self._model_short)
+        self._anthropic: Optional[Anthropic] = None  # Created lazily by _client
+
+        # Opt-in exact-match response cache (saves spend on repeated dev/CI runs)
+        self.prompt_cache: Optional[PromptCache] = None
+        if os.getenv("DOGWALKER_LLM_CACHE") == "1" and not skip_cache:
+            self.prompt_cache = PromptCache()
+
+        # Title/plan/searches from the batched prep call, keyed by task description
+        self._task_artifacts: dict[str, tuple[str, str, list[str]]] = {}
+
+        # Project layout lookups for validation (can't change mid-task)
+        self._project_types: Optional[list[str]] = None
+        self._ts_project_dir: Optional[Path] = None
+
+        # Directory listings for image existence checks (images don't change mid-task)
+        self._image_dir_entries: dict[Path, frozenset[str]] = {}
+        self._image_markdown: dict[tuple, str] = {}
+
+        # (HEAD sha, files) from the last _get_recently_changed_files lookup
+        self._changed_files_cache: Optional[tuple[str, list[str]]] = None
+
+        # Commit the before screenshots were taken at (to find what the after ones must recapture)
+        self._before_screenshots_head: Optional[str] = None
+
+        # Cost tracking: calls append (category, cost) to _cost_log (list.append is
+        # atomic, so concurrent review/test phases need no lock on the hot path) and
+        # flush_costs folds the log into the totals when they are read
+        self._cost_log: list[tuple[str, float]] = []
+        self._cost_lock = threading.Lock()
+        self._total_cost = 0.0
+        self._cost_breakdown = CostBreakdown()
+
+    @property
+    def total_cost(self) -> float:
+        """Total API cost for this task so far (USD)."""
+        self.flush_costs()
+        return self._total_cost
+
+    @property
+    def cost_breakdown(self) -> CostBreakdown:
+        """Per-category API cost for this task so far (USD)."""
+        self.flush_costs()
+        return self._cost_breakdown
+
+    def flush_costs(self) -> None:
+        """Fold costs recorded since the last flush into total_cost and cost_breakdown."""
+        with self._cost_lock:
+            # Slice then delete (rather than swapping lists) so an append racing with
+            # the flush lands in the log and is picked up by the next flush
+            count = len(self._cost_log)
+            if not count:
+                return
+            entries = self._cost_log[:count]
+            del self._cost_log[:count]
+
+            for category, cost in entries:
+                self._cost_breakdown.add(category, cost)
+            self._total_cost += sum(cost for _, cost in entries)
+
+    @property
+    def _client(self) -> Anthropic:
+        """
+        Anthropic client, created once and reused so HTTPS connections stay alive.
 
-    def _calculate_cost(self, input_tokens: int, output_tokens: int, model_name: str) -> float:
+        Raises:
+            ValueError: If ANTHROPIC_API_KEY is not set
+        """
+        if self._anthropic is None:
+            api_key = os.getenv("ANTHROPIC_API_KEY")
+            if not api_key:
+                raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+            self._anthropic = Anthropic(api_key=api_key)
+        return self._anthropic
+
+    @functools.cached_property
+    def _model(self) -> Model:
+        """Aider model, shared by every Coder this Dog creates (loads tokenizer/pricing once)."""
+        return Model(self.model_name)
+
+    @functools.cached_property
+    def _io(self) -> InputOutput:
+        """Non-interactive Aider IO for run_task's Coder (concurrent review/test phases make their own)."""
+        return InputOutput(yes=True)
+
+    def _calculate_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        model_name: str,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> float:
         """
         Calculate API cost based on token usage.
 
+        Prompt-cache reads bill at CACHE_READ_MULTIPLIER x input and writes at
+        CACHE_WRITE_MULTIPLIER x input.
+
         Args:
             input_tokens: Number of input tokens
             output_tokens: Number of output tokens
             model_name: Model name (without provider prefix)
+            cache_read_tokens: Input tokens served from the prompt cache
+            cache_write_tokens: Input tokens written to the prompt cache
 
         Returns:
             Cost in dollars
         """
-        pricing = self.MODEL_PRICING.get(model_name)
-        if not pricing:
-            logger.warning(f"No pricing data for model {model_name}, using Sonnet 4.5 pricing")
-            pricing = self.MODEL_PRICING["claude-sonnet-4-20250514"]
-
-        input_cost = (input_tokens / 1_000_000) * pricing["input"]
-        output_cost = (output_tokens / 1_000_000) * pricing["output"]
-        total_cost = input_cost + output_cost
+        # The Dog's own pricing was resolved once in __init__
+        if model_name == self._model_short:
+            input_price, output_price = self._input_per_token, self._output_per_token
+        else:
+            input_price, output_price = self._per_token_pricing(model_name)
 
-        logger.debug(
-            f"Cost calculation: {input_tokens} input + {output_tokens} output tokens = ${total_cost:.4f}"
+        total_cost = (
+            input_tokens * input_price
+            + cache_read_tokens * input_price * CACHE_READ_MULTIPLIER
+            + cache_write_tokens * input_price * CACHE_WRITE_MULTIPLIER
+            + output_tokens * output_price
         )
 
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Cost calculation: {input_tokens} input + {output_tokens} output tokens = ${total_cost:.4f}"
+            )
+
         return total_cost
 
-    def call_claude_api(self, prompt: str, max_tokens: int = 1000, category: str = "other") -> str:
+    def _per_token_pricing(self, model_name: str) -> tuple[float, float]:
+        """
+        Look up (input, output) dollars per token for a model.
+
+        Args:
+            model_name: Model name (without provider prefix)
+
+        Returns:
+            Tuple of (input_price, output_price), Sonnet pricing if the model is unknown
+        """
+        per_token = self._PRICING_PER_TOKEN.get(model_name)
+        if per_token is None:
+            logger.warning(f"No pricing data for model {model_name}, using Sonnet 4.5 pricing")
+            per_token = self._PRICING_PER_TOKEN[self.DEFAULT_PRICING_MODEL]
+        return per_token
+
+    def call_claude_api(
+        self,
+        prompt: str | list[dict[str, Any]],
+        max_tokens: int = 1000,
+        category: str = "other",
+        stop_sequences: Optional[list[str]] = None,
+        model_override: Optional[str] = None,
+    ) -> str:
         """
         Call Claude API directly for text generation (not code editing).
 
-        Automatically tracks API costs.
+        Automatically tracks API costs. When DOGWALKER_LLM_CACHE=1, identical
+        requests are served from the on-disk cache at no cost (unless the Dog
+        was created with skip_cache=True).
 
         Args:
-            prompt: The prompt to send to Claude
+            prompt: The prompt to send to Claude, as text or message content blocks
+                    (e.g., a prompt-cached static prefix plus a variable suffix)
             max_tokens: Maximum tokens in response
             category: Cost category for tracking (e.g., "pr_title", "plan_generation")
+            stop_sequences: Strings that end generation early when emitted (optional)
+            model_override: Model to use instead of the Dog's model, e.g. FAST_META_MODEL (optional)
 
         Returns:
             Claude's response as a string
         """
-        from anthropic import Anthropic
+        return "".join(self.stream_claude(prompt, max_tokens, category, stop_sequences, model_override))
+
+    def stream_claude(
+        self,
+        prompt: str | list[dict[str, Any]],
+        max_tokens: int = 1000,
+        category: str = "other",
+        stop_sequences: Optional[list[str]] = None,
+        model_override: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Stream a Claude API response as text chunks while they are generated.
+
+        Cost tracking and the on-disk cache write happen once the stream is
+        exhausted, so consume the whole iterator (cached responses arrive as a
+        single chunk).
+
+        Args:
+            prompt: The prompt to send to Claude, as text or message content blocks
+            max_tokens: Maximum tokens in response
+            category: Cost category for tracking (e.g., "pr_title", "plan_generation")
+            stop_sequences: Strings that end generation early when emitted (optional)
+            model_override: Model to use instead of the Dog's model, e.g. FAST_META_MODEL (optional)
+
+        Yields:
+            Response text chunks, in order
+
+        Raises:
+            ValueError: If the prompt exceeds MAX_PROMPT_TOKENS (checked before sending)
+        """
+        model_name = model_override.replace("anthropic/", "") if model_override else self._model_short
 
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+        request_kwargs: dict[str, Any] = {}
+        if stop_sequences:
+            request_kwargs["stop_sequences"] = stop_sequences
 
-        client = Anthropic(api_key=api_key)
+        prompt_text = prompt if isinstance(prompt, str) else "".join(block["text"] for block in prompt)
 
-        # Extract model name without provider prefix (Anthropic SDK doesn't need "anthropic/" prefix)
-        model_name = self.model_name.replace("anthropic/", "")
+        cache_key = None
+        if self.prompt_cache:
+            cache_key = PromptCache.make_key(model_name, prompt, max_tokens, **request_kwargs)
+            cached = self.prompt_cache.get(cache_key)
+            if cached:
+                logger.info(f"API call ({category}): cache hit, $0.0000")
+                yield cached.response
+                return
 
-        response = client.messages.create(
+        if len(prompt_text) > MAX_PROMPT_TOKENS * MIN_CHARS_PER_TOKEN:
+            # count_tokens is free; a doomed request would bill the whole prefill first
+            token_count = self._client.messages.count_tokens(
+                model=model_name, messages=[{"role": "user", "content": prompt}]
+            ).input_tokens
+            if token_count > MAX_PROMPT_TOKENS:
+                raise ValueError(f"Prompt too large ({token_count} > {MAX_PROMPT_TOKENS} tokens) - not sending")
+
+        chunks = []
+        with self._client.messages.stream(
             model=model_name,
             max_tokens=max_tokens,
             messages=[
                 {"role": "user", "content": prompt}
-            ]
-        )
-
-        # Track cost
+            ],
+            **request_kwargs,
+        ) as stream:
+            for text in stream.text_stream:
+                chunks.append(text)
+                yield text
+            usage = stream.get_final_message().usage
+
+        # Track cost. Prompt-cache token counts are absent on older SDKs
         cost = self._calculate_cost(
-            input_tokens=response.usage.input_tokens,
-            output_tokens=response.usage.output_tokens,
-            model_name=model_name
+            usage.input_tokens,
+            usage.output_tokens,
+            model_name,
+            cache_read_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
         )
 
-        self.total_cost += cost
-        if category in self.cost_breakdown:
-            self.cost_breakdown[category] += cost
-        else:
-            # For unknown categories, create a new entry
-            self.cost_breakdown[category] = cost
+        self._cost_log.append((category, cost))
+        logger.info(f"API call ({category}): ${cost:.4f}")
 
-        logger.info(f"API call ({category}): ${cost:.4f} - Total cost: ${self.total_cost:.4f}")
+        if cache_key:
+            self.prompt_cache.put(cache_key, model_name, "".join(chunks), usage.input_tokens, usage.output_tokens)
 
-        return response.content[0].text
+    def _track_aider_cost(self, coder: Coder, category: str, label: str, cost_before: float = 0.0) -> None:
+        """
+        Add an Aider Coder's accumulated cost to the task totals.
+
+        Args:
+            coder: Coder whose run just finished
+            category: Cost category for tracking (e.g., "implementation")
+            label: Human-readable phase name for logging
+            cost_before: Coder's total_cost before this run, for reused Coders (default: 0.0)
+        """
+        aider_cost = getattr(coder, 'total_cost', 0.0) - cost_before
+        if not aider_cost:
+            return
+
+        self._cost_log.append((category, aider_cost))
+        logger.info(f"Aider {label} cost: ${aider_cost:.4f}")
 
     def generate_pr_title(self, task_description: str, max_length: int = 57) -> str:
         """
@@ -151,84 +797,103 @@ class Dog:
         Returns:
             Concise PR title as a string
         """
-        logger.info(f"Generating PR title for: {task_description}")
+        if task_description in self._task_artifacts:
+            return self._task_artifacts[task_description][0]
 
-        title_prompt = f"""Given this task: "{task_description}"
-
-Create a concise, descriptive pull request title that summarizes this change.
-
-Requirements:
-- Maximum {max_length} characters
-- Use imperative mood (e.g., "Add feature" not "Adds feature" or "Added feature")
-- Be specific about what changed
-- No punctuation at the end
-- Use title case for first word only
+        logger.info(f"Generating PR title for: {task_description}")
 
-Examples:
-- "Add rate limiting to login endpoint"
-- "Fix authentication token expiration"
-- "Refactor user service for better testability"
-- "Update Node.js dependencies to latest versions"
+        # Fast path: a short, single-line, imperative request is already a usable title
+        title = _task_as_title(task_description, max_length)
+        if title:
+            logger.debug(f"Task description already fits as PR title, skipping API call ($0.0000): {title}")
+            return title
 
-Provide ONLY the title text in your response. No explanation, no quotes, no additional text."""
+        prompt = self._title_prompt(task_description, max_length)
+        hint = self._similar_title_hint(task_description, max_length)
+        if hint:
+            prompt.insert(1, hint)
 
         try:
-            title = self.call_claude_api(title_prompt, max_tokens=100, category="pr_title")
-            # Clean up the response
-            title = title.strip().strip('"').strip("'")
-            # Truncate if still too long
-            if len(title) > max_length:
-                title = title[:max_length].rsplit(' ', 1)[0]
+            # A 57-char title is ~15 tokens; keep the ceiling tight so the model stops early
+            title = self.call_claude_api(
+                prompt,
+                max_tokens=30,
+                category="pr_title",
+                model_override=FAST_META_MODEL,
+            )
+            title = self._clean_pr_title(title, max_length)
+            self._remember_title(task_description, max_length, title)
             return title
 
         except Exception as e:
             logger.exception(f"PR title generation failed: {e}")
             # Fallback: use first part of task description
-            return task_description[:max_length].rsplit(' ', 1)[0]
+            return truncate_title(task_description, max_length)
 
-    def generate_plan(self, task_description: str) -> str:
+    def _similar_title_hint(self, task_description: str, max_length: int) -> Optional[dict[str, Any]]:
         """
-        Generate an implementation plan for the task using Claude API directly.
+        Offer a similar past task's PR title as an exemplar for the title question.
+
+        Near-duplicate tasks (e.g., re-runs with a reworded request) get a past
+        title to adapt; it is never reused without a model call.
 
         Args:
             task_description: Natural language description of code changes
+            max_length: Maximum length for the title
 
         Returns:
-            Implementation plan as a string
+            Content block to insert after the cached static prefix, or None if no
+            cached task is similar enough
         """
-        logger.info(f"Generating implementation plan for: {task_description}")
-
-        # Removed search note - searches are now done sparingly and automatically only when critical
-
-        plan_prompt = f"""Create an implementation plan for this task: "{task_description}"
+        if self.prompt_cache is None:
+            return None
+        match = self.prompt_cache.find_similar(f"pr_title:{max_length}", task_description)
+        if not match or match[0] < TITLE_EXEMPLAR_SIMILARITY:
+            return None
+        return {
+            "type": "text",
+            "text": f'PR title used for a similar past task "{match[1]}": {match[2]}\n'
+                    "Adapt it to the task below.",
+        }
 
-Format your response as a clean, structured markdown plan with these sections:
+    def _remember_title(self, task_description: str, max_length: int, title: str) -> None:
+        """Store a generated PR title for _similar_title_hint on later tasks."""
+        if title and self.prompt_cache is not None:
+            self.prompt_cache.put_similar(f"pr_title:{max_length}", task_description, title)
 
-**Architecture**
-- List components/services/modules that will be affected
+    def _title_prompt(self, task_description: str, max_length: int) -> list[dict[str, Any]]:
+        """Build the PR title prompt (static rules cached, task appended)."""
+        return _cached_prefix_prompt(_title_prompt_static(max_length), task_description)
 
-**Files to Modify/Create**
-- List specific files
+    @staticmethod
+    def _clean_pr_title(title: str, max_length: int) -> str:
+        """Normalize a model-generated title: first line only, no quotes, within max_length."""
+        title = title.strip().split("\n", 1)[0].strip().strip('"').strip("'")
+        return truncate_title(title, max_length)
 
-**Implementation Approach**
-- High-level steps to solve the problem
-- Any breaking changes or migrations needed
+    def generate_plan(self, task_description: str) -> str:
+        """
+        Generate an implementation plan for the task using Claude API directly.
 
-**Commit Strategy**
-- Break into commits of ≤500 LOC each
-- List commits in order
+        Args:
+            task_description: Natural language description of code changes
 
-CRITICAL RULES:
-- Provide ONLY the structured plan above
-- NO conversational text (no "Perfect!", "Let's start", etc.)
-- NO code snippets or file contents
-- NO commands (no mkdir, npm install, etc.)
-- Just clean markdown bullets describing WHAT will be done, not HOW
+        Returns:
+            Implementation plan as a string
+        """
+        if task_description in self._task_artifacts:
+            return self._task_artifacts[task_description][1]
 
-Keep the entire plan under 250 words."""
+        logger.info(f"Generating implementation plan for: {task_description}")
 
         try:
-            plan = self.call_claude_api(plan_prompt, max_tokens=800, category="plan_generation")
+            # 250 words is ~350 tokens; stop at a trailing horizontal rule (usually chatter)
+            plan = self.call_claude_api(
+                self._plan_prompt(task_description),
+                max_tokens=500,
+                category="plan_generation",
+                stop_sequences=["\n\n---\n\n"],
+            )
             logger.info("Implementation plan generated")
             return plan.strip()
 
@@ -240,6 +905,10 @@ Keep the entire plan under 250 words."""
 - Follow project patterns and conventions
 - Add error handling and validation"""
 
+    def _plan_prompt(self, task_description: str) -> list[dict[str, Any]]:
+        """Build the implementation plan prompt (static rules cached, task appended)."""
+        return _cached_prefix_prompt(_PLAN_PROMPT_STATIC, task_description)
+
     def _determine_needed_searches(self, task_description: str) -> list[str]:
         """
         Use AI to determine what internet searches would be helpful for this task.
@@ -253,52 +922,164 @@ Keep the entire plan under 250 words."""
         if not self.search_tools:
             return []
 
+        if task_description in self._task_artifacts:
+            return self._task_artifacts[task_description][2]
+
+        if not _SEARCH_TRIGGER_RE.search(task_description):
+            logger.debug("No search triggers in task - skipping search analysis ($0.0000)")
+            return []
+
         logger.info("Determining if internet searches would be helpful...")
 
-        analysis_prompt = f"""Analyze this coding task and determine if internet searches are CRITICAL:
+        try:
+            response = self.call_claude_api(
+                self._search_analysis_prompt(task_description),
+                max_tokens=200,
+                category="search_analysis",
+                model_override=FAST_META_MODEL,
+            )
+            return self._parse_search_queries(response)
 
-Task: "{task_description}"
+        except Exception as e:
+            logger.error(f"Failed to analyze search needs: {e}")
+            return []
 
-IMPORTANT: Searches consume significant tokens and time. ONLY search if ABSOLUTELY CRITICAL.
+    def _search_analysis_prompt(self, task_description: str) -> list[dict[str, Any]]:
+        """Build the prompt asking whether internet searches are needed (static rules cached, task appended)."""
+        return _cached_prefix_prompt(_SEARCH_ANALYSIS_STATIC, task_description)
 
-Only search if the task requires:
-- **Breaking API changes** - New API endpoints or changed syntax you don't know
-- **Version-specific bugs** - Known issues in specific library versions
-- **External service specs** - Third-party API requirements not in codebase
+    @staticmethod
+    def _parse_search_queries(response: str) -> list[str]:
+        """Parse a search-analysis answer ("NONE" or one query per line) into queries."""
+        response = response.strip()
 
-DO NOT search for:
-- ❌ Design patterns (use existing codebase patterns)
-- ❌ Best practices (follow existing code style)
-- ❌ General examples (read similar code in repo)
-- ❌ UI/UX patterns (user provided requirements/images)
-- ❌ Common tasks you know how to do
+        if response.upper() == "NONE" or not response:
+            logger.info("No searches needed for this task")
+            return []
 
-Default answer: "NONE"
+        # Parse queries (one per line)
+        queries = [q.strip() for q in response.split('\n') if q.strip() and not q.strip().startswith('-')]
 
-Only if truly critical and you cannot proceed without external docs, provide 1-2 specific queries (one per line).
+        # Limit to 2 queries max (searches are expensive)
+        queries = queries[:2]
 
-Provide ONLY "NONE" or the queries, no explanations."""
+        logger.info(f"Identified {len(queries)} helpful searches: {queries}")
+        return queries
 
-        try:
-            response = self.call_claude_api(analysis_prompt, max_tokens=200, category="search_analysis")
-            response = response.strip()
+    def generate_task_artifacts(self, task_description: str, max_length: int = 57) -> tuple[str, str, list[str]]:
+        """
+        Generate the PR title, plan, and search queries in a single Claude request.
 
-            if response.upper() == "NONE" or not response:
-                logger.info("No searches needed for this task")
-                return []
+        Asks the open questions in one batched prompt so the task description is
+        sent (and billed) once. A task that already reads as a title keeps it and
+        the title question is left out; with only the plan left to ask, it goes
+        straight to generate_plan. Answers missing from the response are
+        re-requested individually. Results are memoized, so generate_pr_title,
+        generate_plan, and _determine_needed_searches return them afterwards
+        without another API call.
 
-            # Parse queries (one per line)
-            queries = [q.strip() for q in response.split('\n') if q.strip() and not q.strip().startswith('-')]
+        Args:
+            task_description: Natural language description of code changes
+            max_length: Maximum length for the PR title
 
-            # Limit to 2 queries max (searches are expensive)
-            queries = queries[:2]
+        Returns:
+            Tuple of (pr_title, plan, search_queries)
+        """
+        if task_description in self._task_artifacts:
+            return self._task_artifacts[task_description]
+
+        # Only ask about searches when the task mentions a search trigger (see _determine_needed_searches)
+        ask_searches = bool(self.search_tools) and bool(_SEARCH_TRIGGER_RE.search(task_description))
+        pr_title = _task_as_title(task_description, max_length)
+
+        answers: dict[str, str] = {}
+        batched = pr_title is None or ask_searches
+        if batched:
+            logger.info(f"Generating task prep answers in one request for: {task_description}")
+            batch_static = _batch_prompt_static(max_length, pr_title is None, ask_searches)
+            prompt = _cached_prefix_prompt(batch_static, task_description)
+            if pr_title is None:
+                hint = self._similar_title_hint(task_description, max_length)
+                if hint:
+                    prompt.insert(1, hint)
+
+            # The plan comes last, so stopping at its closing tag (or the plan's usual
+            # trailing horizontal rule) skips the rest of the envelope. Stays on the
+            # Dog's model (not FAST_META_MODEL) because it writes the plan
+            response = self.call_claude_api(
+                prompt,
+                max_tokens=800,
+                category="task_prep_batch",
+                stop_sequences=["</plan>", "\n\n---\n\n"],
+            )
+            for tag in ("pr_title", "searches"):
+                match = re.search(rf"<{tag}>(.*?)</{tag}>", response, re.DOTALL)
+                if match and match.group(1).strip():
+                    answers[tag] = match.group(1)
+            match = re.search(r"<plan>(.*?)(?:</plan>|$)", response, re.DOTALL)
+            if match and match.group(1).strip():
+                answers["plan"] = match.group(1)
+
+        if pr_title is None and "pr_title" in answers:
+            pr_title = self._clean_pr_title(answers["pr_title"], max_length) or None
+            if pr_title:
+                self._remember_title(task_description, max_length, pr_title)
+        plan = answers["plan"].strip() if "plan" in answers else None
+        search_queries = self._parse_search_queries(answers["searches"]) if "searches" in answers else None
+        if not ask_searches:
+            search_queries = []
+
+        missing = [
+            name for name, value in (("pr_title", pr_title), ("plan", plan), ("searches", search_queries))
+            if value is None
+        ]
+        if missing:
+            if batched:
+                logger.warning(f"Batched task prep response is missing {missing} - requesting them separately")
+            pr_title, plan, search_queries = asyncio.run(
+                self._fill_task_artifacts(task_description, max_length, pr_title, plan, search_queries)
+            )
 
-            logger.info(f"Identified {len(queries)} helpful searches: {queries}")
-            return queries
+        artifacts = (pr_title, plan, search_queries)
+        self._task_artifacts[task_description] = artifacts
+        return artifacts
 
-        except Exception as e:
-            logger.error(f"Failed to analyze search needs: {e}")
-            return []
+    async def _fill_task_artifacts(
+        self,
+        task_description: str,
+        max_length: int,
+        pr_title: Optional[str],
+        plan: Optional[str],
+        search_queries: Optional[list[str]]
+    ) -> tuple[str, str, list[str]]:
+        """
+        Request the task artifacts that are still missing, concurrently.
+
+        Args:
+            task_description: Natural language description of code changes
+            max_length: Maximum length for the PR title
+            pr_title: PR title, or None to generate it
+            plan: Implementation plan, or None to generate it
+            search_queries: Search queries, or None to determine them
+
+        Returns:
+            Tuple of (pr_title, plan, search_queries)
+        """
+        # The shared sync client is thread-safe, so each call gets its own thread
+        calls = {}
+        if pr_title is None:
+            calls["pr_title"] = asyncio.to_thread(self.generate_pr_title, task_description, max_length)
+        if plan is None:
+            calls["plan"] = asyncio.to_thread(self.generate_plan, task_description)
+        if search_queries is None:
+            calls["searches"] = asyncio.to_thread(self._determine_needed_searches, task_description)
+
+        results = dict(zip(calls, await asyncio.gather(*calls.values())))
+        return (
+            results.get("pr_title", pr_title),
+            results.get("plan", plan),
+            results.get("searches", search_queries),
+        )
 
     def _perform_searches(self, queries: list[str]) -> str:
         """
@@ -315,13 +1096,13 @@ Provide ONLY "NONE" or the queries, no explanations."""
 
         logger.info(f"Performing {len(queries)} internet searches...")
 
+        # Searches are independent and IO-bound - run them concurrently
         search_results = []
-        for query in queries:
-            try:
-                results = self.search_tools.search_with_context(query, max_results=3)
+        for query, results in zip(queries, asyncio.run(self._search_all(queries))):
+            if isinstance(results, Exception):
+                logger.error(f"Search failed for '{query}': {results}")
+            else:
                 search_results.append((query, results))
-            except Exception as e:
-                logger.error(f"Search failed for '{query}': {e}")
 
         if not search_results:
             return ""
@@ -332,15 +1113,54 @@ Provide ONLY "NONE" or the queries, no explanations."""
             title="Proactive Internet Research"
         )
 
-        logger.info(f"Search context generated: {len(context)} characters")
-        return context
+        logger.info(f"Search context generated: {len(context)} characters")
+        return context
+
+    async def _search_all(self, queries: list[str]) -> list[Any]:
+        """
+        Run search_with_context for every query concurrently.
+
+        Args:
+            queries: List of search queries
+
+        Returns:
+            Per-query results, or the exception raised for that query
+        """
+        return await asyncio.gather(
+            *(self.search_tools.search_with_context_async(query, max_results=3) for query in queries),
+            return_exceptions=True,
+        )
+
+    def prepare_task_artifacts(self, task_description: str, max_length: int = 57) -> tuple[str, str, list[str]]:
+        """
+        Generate the PR title, implementation plan, and search queries up front.
+
+        Tries a single batched request first (generate_task_artifacts). If that
+        request fails, the three Claude calls - which depend only on the task
+        description - are issued concurrently instead of one API round trip after
+        another.
+
+        Args:
+            task_description: Natural language description of code changes
+            max_length: Maximum length for the PR title
+
+        Returns:
+            Tuple of (pr_title, plan, search_queries)
+        """
+        try:
+            return self.generate_task_artifacts(task_description, max_length)
+        except Exception as e:
+            logger.warning(f"Batched task prep failed ({e}) - falling back to separate calls")
+
+        return asyncio.run(self._fill_task_artifacts(task_description, max_length, None, None, None))
 
     def run_task(
         self,
         task_description: str,
         image_files: Optional[list[str]] = None,
         web_context: Optional[str] = None,
-        allow_no_changes: bool = False
+        allow_no_changes: bool = False,
+        search_queries: Optional[list[str]] = None
     ) -> bool:
         """
         Execute a coding task using Aider.
@@ -352,6 +1172,8 @@ Provide ONLY "NONE" or the queries, no explanations."""
             allow_no_changes: If True, return success even if no files were modified.
                             Use for feedback/review tasks where no changes might be valid.
                             Default False for initial implementation (must make changes).
+            search_queries: Precomputed search queries, e.g. from prepare_task_artifacts
+                            (optional - determined via Claude if not provided)
 
         Returns:
             True if task completed successfully, False otherwise
@@ -364,39 +1186,44 @@ Provide ONLY "NONE" or the queries, no explanations."""
         # Proactively determine and perform needed searches
         search_context = ""
         if self.search_tools:
-            search_queries = self._determine_needed_searches(task_description)
+            if search_queries is None:
+                search_queries = self._determine_needed_searches(task_description)
             if search_queries:
                 search_context = self._perform_searches(search_queries)
 
         try:
-            # Change to repo directory (required by Aider)
-            import os
-            old_cwd = os.getcwd()
-            os.chdir(self.repo_path)
-
-            # Initialize Aider with non-interactive IO
-            model = Model(self.model_name)
-            io = InputOutput(yes=True)  # Non-interactive mode
-
-            self.coder = Coder.create(
-                main_model=model,
-                io=io,  # Use our non-interactive IO
-                fnames=None,  # Auto-detect all relevant files - full access
-                read_only_fnames=None,  # No read-only restrictions
-                auto_commits=False,  # Disable auto-commits - we'll validate first
-                map_tokens=self.map_tokens,  # Repo map for context
-                edit_format="diff",  # Use diff format for edits
-                auto_lint=True,  # Enable linting to catch errors early
-            )
-
-            logger.info(f"Aider initialized with model {self.model_name}")
+            # Initialize Aider once with the shared model and non-interactive IO;
+            # later rounds (feedback, fixes) reuse it instead of rebuilding the repo map
+            if self._task_coder is None:
+                self._task_coder = Coder.create(
+                    main_model=self._model,
+                    io=self._io,  # Use our non-interactive IO
+                    repo=self._aider_repo(self.repo_path),  # Explicit repo root instead of os.chdir
+                    fnames=None,  # Auto-detect all relevant files - full access
+                    read_only_fnames=None,  # No read-only restrictions
+                    auto_commits=False,  # Disable auto-commits - we'll validate first
+                    map_tokens=self.map_tokens,  # Repo map for context
+                    edit_format="diff",  # Use diff format for edits
+                    auto_lint=True,  # Enable linting to catch errors early
+                    cache_prompts=True,  # Mark stable prompt prefixes for provider-side caching
+                )
+                logger.info(f"Aider initialized with model {self.model_name}")
+            else:
+                logger.info("Reusing Aider session from the previous round")
+            self.coder = self._task_coder
+            cost_before = getattr(self.coder, 'total_cost', 0.0)
 
             # Build context about images if present
             image_context = ""
             if image_files:
-                image_paths = [Path(img).relative_to(self.repo_path) for img in image_files if Path(img).exists()]
+                # Existence comes from one cached directory listing; paths outside the repo are skipped
+                image_paths = [
+                    str(path).removeprefix(self._repo_prefix)
+                    for path in self._list_existing_images(image_files)
+                    if str(path).startswith(self._repo_prefix)
+                ]
                 if image_paths:
-                    image_list = "\n".join([f"  - {path}" for path in image_paths])
+                    image_list = "  - " + "\n  - ".join(image_paths)
                     image_context = f"""
 CONTEXT - Reference Images:
 The following images have been provided as context for this task:
@@ -405,6 +1232,9 @@ The following images have been provided as context for this task:
 These images are located in the `.dogwalker_images/` directory and can provide visual guidance for your implementation.
 """
 
+            # Trim search results first, then web context, so the prompt fits the context window
+            web_context, search_context = self._fit_task_context(web_context or "", search_context)
+
             # Include web context if present
             web_context_section = ""
             if web_context:
@@ -441,39 +1271,23 @@ Follow the commit strategy you outlined in the implementation plan.
 
             # Verify Aider actually made file changes (not just responded)
             # Check BOTH uncommitted changes AND recent commits (Aider might auto-commit despite flag)
-            import subprocess
-
-            # Check for uncommitted changes
-            git_status = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            changed_paths = self._uncommitted_changes()
 
             # Check for commits made by Aider (in case it auto-committed despite auto_commits=False)
-            git_log = subprocess.run(
-                ["git", "log", "--oneline", "-5"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            recent_commits = self._recent_commits(5)
 
-            logger.info(f"Git status after Aider run:\n{git_status.stdout if git_status.stdout else '(no uncommitted changes)'}")
-            logger.info(f"Recent git commits:\n{git_log.stdout}")
+            changed_list = "\n".join(changed_paths)
+            logger.info(f"Git status after Aider run:\n{changed_list or '(no uncommitted changes)'}")
+            logger.info("Recent git commits:\n" + "\n".join(recent_commits))
 
-            if not git_status.stdout.strip():
+            if not changed_paths:
                 if allow_no_changes:
                     logger.info("Aider ran but made no file changes (feedback may not have required changes)")
-                    os.chdir(old_cwd)  # Restore working directory
                     return True  # Not an error - task completed, just no changes needed
                 else:
                     logger.error("❌ Aider made NO file changes - this is unexpected for initial implementation")
                     logger.error(f"Task description: {task_description[:200]}...")
                     logger.error(f"Aider's response: {str(result)[:500]}...")
-                    os.chdir(old_cwd)
                     raise Exception(
                         "Aider did not produce any code changes. This usually means:\n"
                         "1. The task description was unclear or Aider misunderstood it\n"
@@ -482,7 +1296,7 @@ Follow the commit strategy you outlined in the implementation plan.
                         "Check the logs above for Aider's actual response."
                     )
 
-            logger.info(f"Aider made changes to files:\n{git_status.stdout}")
+            logger.info(f"Aider made changes to files:\n{changed_list}")
 
             # Validate code compiles before committing (TypeScript/Next.js check)
             logger.info("Validating changes compile successfully...")
@@ -514,7 +1328,6 @@ Steps to fix:
                 if not validation_passed:
                     logger.error("❌ Validation still failing after attempted fixes")
                     logger.error(f"Remaining errors:\n{validation_errors}")
-                    os.chdir(old_cwd)
                     raise Exception("Aider unable to fix compilation errors - manual intervention required")
 
             # Commit the changes now that validation passed
@@ -522,50 +1335,134 @@ Steps to fix:
             self._commit_changes("Implement task changes (validated)")
 
             # Track Aider cost (Aider internally tracks total_cost)
-            if hasattr(self.coder, 'total_cost') and self.coder.total_cost:
-                aider_cost = self.coder.total_cost
-                self.total_cost += aider_cost
-                self.cost_breakdown["implementation"] += aider_cost
-                logger.info(f"Aider implementation cost: ${aider_cost:.4f} - Total cost: ${self.total_cost:.4f}")
-
-            logger.info("Aider task completed successfully with validated changes")
-            os.chdir(old_cwd)  # Restore working directory
+            self._track_aider_cost(self.coder, "implementation", "implementation", cost_before)
+
+            logger.info(f"Aider task completed successfully with validated changes - Total cost: ${self.total_cost:.4f}")
             return True
 
         except Exception as e:
             logger.exception(f"Aider task failed: {e}")
-            os.chdir(old_cwd)  # Restore working directory even on error
             raise
 
+    def _fit_task_context(self, web_context: str, search_context: str) -> tuple[str, str]:
+        """
+        Trim web and search context to MAX_TASK_CONTEXT_TOKENS combined.
+
+        Search results are trimmed first (dropping the lowest-ranked ones at the
+        end), then web context. Tokens are counted locally with Aider's model.
+
+        Args:
+            web_context: Formatted context from fetched websites
+            search_context: Formatted internet search results
+
+        Returns:
+            Tuple of (web_context, search_context), truncated if needed
+        """
+        if len(web_context) + len(search_context) <= MAX_TASK_CONTEXT_TOKENS * MIN_CHARS_PER_TOKEN:
+            return web_context, search_context
+
+        web_tokens = self._model.token_count(web_context) if web_context else 0
+        search_tokens = self._model.token_count(search_context) if search_context else 0
+        if web_tokens + search_tokens <= MAX_TASK_CONTEXT_TOKENS:
+            return web_context, search_context
+
+        logger.warning(
+            f"Task context too large ({web_tokens + search_tokens} tokens) - "
+            f"truncating to {MAX_TASK_CONTEXT_TOKENS}"
+        )
+        search_budget = max(MAX_TASK_CONTEXT_TOKENS - web_tokens, 0)
+        search_context = self._truncate_to_tokens(search_context, search_tokens, search_budget)
+        web_budget = MAX_TASK_CONTEXT_TOKENS - min(search_tokens, search_budget)
+        web_context = self._truncate_to_tokens(web_context, web_tokens, web_budget)
+        return web_context, search_context
+
+    @staticmethod
+    def _truncate_to_tokens(text: str, token_count: int, max_tokens: int) -> str:
+        """Cut text proportionally so roughly max_tokens of its token_count remain."""
+        if token_count <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+        keep_chars = len(text) * max_tokens // token_count
+        return text[:keep_chars] + "\n[... truncated to fit the context window ...]"
+
+    def _aider_repo(self, work_path: Path, io: Optional[InputOutput] = None) -> GitRepo:
+        """
+        Build the Aider GitRepo for a working tree.
+
+        Passing the repo to Coder.create roots Aider (file paths, lint and shell
+        commands) at work_path without a process-global os.chdir, so Dogs - and a
+        Dog's self-review (in a worktree) alongside test writing (in repo_path) -
+        can run in parallel threads.
+
+        Args:
+            work_path: Repository or worktree root
+            io: Aider IO for the repo (default: the Dog's shared IO)
+
+        Returns:
+            GitRepo rooted at work_path
+        """
+        return GitRepo(io or self._io, None, str(work_path))
+
     def _detect_project_type(self) -> list[str]:
         """
         Detect project type(s) based on files in repo.
 
+        Lists the repo root once and caches the result for the rest of the task.
+
         Returns:
             List of detected project types (can be multiple, e.g., ["python", "nodejs"])
         """
+        if self._project_types is not None:
+            return self._project_types
+
+        with os.scandir(self.repo_path) as it:
+            names = {entry.name for entry in it}
+
         project_types = []
 
         # Check for Node.js/TypeScript
-        if (self.repo_path / "package.json").exists():
+        if "package.json" in names:
             project_types.append("nodejs")
 
         # Check for Python
-        if (self.repo_path / "setup.py").exists() or \
-           (self.repo_path / "pyproject.toml").exists() or \
-           (self.repo_path / "requirements.txt").exists():
+        if names & PYTHON_PROJECT_MARKERS:
             project_types.append("python")
 
         # Check for Go
-        if (self.repo_path / "go.mod").exists():
+        if "go.mod" in names:
             project_types.append("go")
 
         # Check for Rust
-        if (self.repo_path / "Cargo.toml").exists():
+        if "Cargo.toml" in names:
             project_types.append("rust")
 
+        self._project_types = project_types
         return project_types
 
+    def _find_ts_project_dir(self) -> Path:
+        """
+        Find the directory holding tsconfig.json (handles common monorepo layouts).
+
+        Cached after the first lookup.
+
+        Returns:
+            TypeScript project directory (repo root if no tsconfig.json is found)
+        """
+        if self._ts_project_dir is not None:
+            return self._ts_project_dir
+
+        ts_project_dir = self.repo_path
+        for relative_dir in TSCONFIG_DIRS:
+            # Only build a Path for the directory that actually holds tsconfig.json
+            if os.path.isfile(os.path.join(self.repo_path, relative_dir, "tsconfig.json")):
+                ts_project_dir = self.repo_path / relative_dir if relative_dir else self.repo_path
+                logger.info(f"Found tsconfig.json at {ts_project_dir}")
+                break
+
+        self._ts_project_dir = ts_project_dir
+        return ts_project_dir
+
     def _validate_changes_compile(self) -> tuple[bool, str]:
         """
         Validate that code changes compile/type-check successfully.
@@ -579,8 +1476,6 @@ Steps to fix:
                 - validation_passed: True if validation passed OR no validators available
                 - error_output: Error messages if validation failed, empty string otherwise
         """
-        import subprocess
-
         logger.info("Running compilation/type-check validation...")
 
         # Detect project type(s)
@@ -593,258 +1488,718 @@ Steps to fix:
 
         logger.info(f"Detected project types: {project_types}")
 
-        validation_passed = False
-        validation_attempted = False
-        collected_errors = []
+        validation_jobs: list[ValidationJob] = []
 
         # Node.js/TypeScript validation
         if "nodejs" in project_types:
             logger.info("Attempting Node.js/TypeScript validation...")
 
-            # Ensure dependencies are installed
-            node_modules = self.repo_path / "node_modules"
-            if not node_modules.exists():
-                logger.info("node_modules not found - installing dependencies first...")
-                try:
-                    install_result = subprocess.run(
-                        ["npm", "install"],
-                        cwd=self.repo_path,
-                        capture_output=True,
-                        text=True,
-                        timeout=180  # 3 minutes max
-                    )
-                    if install_result.returncode != 0:
-                        logger.warning(f"npm install failed: {install_result.stderr[:500]}")
-                        logger.info("Skipping Node.js validation due to dependency issues")
-                    else:
-                        logger.info("✅ npm install completed successfully")
-                except subprocess.TimeoutExpired:
-                    logger.warning("npm install timed out - skipping Node.js validation")
-                except Exception as e:
-                    logger.warning(f"npm install error: {e} - skipping Node.js validation")
-
             # Only try TypeScript validation if dependencies installed successfully
-            if node_modules.exists():
-                validation_attempted = True
-
+            if self._ensure_node_dependencies():
                 # Detect if this is a monorepo and find TypeScript config
-                ts_project_dir = self.repo_path
-                tsconfig_locations = [
-                    self.repo_path / "tsconfig.json",  # Root
-                    self.repo_path / "apps" / "frontend" / "tsconfig.json",  # Common monorepo pattern
-                    self.repo_path / "packages" / "frontend" / "tsconfig.json",
-                ]
-
-                for location in tsconfig_locations:
-                    if location.exists():
-                        ts_project_dir = location.parent
-                        logger.info(f"Found tsconfig.json at {ts_project_dir}")
-                        break
-
-                ts_commands = [
-                    ("npx tsc --noEmit", "TypeScript compiler"),
-                    ("npm run type-check", "TypeScript type-check"),
-                ]
-
-                for command, description in ts_commands:
-                    try:
-                        result = subprocess.run(
-                            command.split(),
-                            cwd=ts_project_dir,  # Run from TypeScript project directory
-                            capture_output=True,
-                            text=True,
-                            timeout=120
-                        )
-
-                        if result.returncode == 0:
-                            logger.info(f"✅ {description} passed")
-                            validation_passed = True
-                            break
-                        else:
-                            # Check if this is a real code error vs missing command
-                            stderr_lower = result.stderr.lower()
-                            if "command not found" in stderr_lower or "not found" in stderr_lower:
-                                logger.debug(f"{description} not available in this project")
-                                continue
-
-                            # Collect error output
-                            error_msg = f"=== {description} failed ===\n"
-                            if result.stdout:
-                                error_msg += f"STDOUT:\n{result.stdout}\n"
-                            if result.stderr:
-                                error_msg += f"STDERR:\n{result.stderr}\n"
-                            collected_errors.append(error_msg)
-
-                            logger.warning(f"❌ {description} failed:")
-                            logger.warning(f"STDOUT: {result.stdout[:500]}")
-                            logger.warning(f"STDERR: {result.stderr[:500]}")
-                            # This is a real validation failure - return immediately with errors
-                            return False, "\n".join(collected_errors)
-
-                    except FileNotFoundError:
-                        logger.debug(f"{description} command not found")
-                        continue
-                    except subprocess.TimeoutExpired:
-                        logger.warning(f"{description} timed out")
-                        continue
+                ts_project_dir = self._find_ts_project_dir()
+
+                # Prefer the project's own type-check script; otherwise call the installed tsc.
+                # Never fall back to `npx tsc`: without a local typescript it silently downloads one
+                tsc = self._find_local_tsc(ts_project_dir)
+                if "type-check" in self._package_scripts(ts_project_dir):
+                    command, description = ["npm", "run", "type-check"], "TypeScript type-check"
+                elif tsc is not None:
+                    build_info = self._tool_cache_dir("tsc") / "tsconfig.tsbuildinfo"
+                    command = [str(tsc), "--noEmit", "--incremental", "--tsBuildInfoFile", str(build_info)]
+                    description = "TypeScript compiler"
+                else:
+                    command = None
+                    logger.info("No type-check script or local TypeScript install - skipping TypeScript validation")
+
+                if command:
+                    validation_jobs.append(ValidationJob(
+                        description=description,
+                        command=command,
+                        cwd=ts_project_dir,  # Run from TypeScript project directory
+                        timeout=120,
+                        missing_markers=("command not found", "not found"),
+                    ))
 
         # Python validation
-        if "python" in project_types and not validation_passed:
+        if "python" in project_types:
             logger.info("Attempting Python validation...")
-            validation_attempted = True
 
             # Get changed Python files
-            changed_files = self._get_recently_changed_files()
+            changed_files = self._get_recently_changed_files(self._task_coder)
             python_files = [f for f in changed_files if f.endswith('.py')]
 
             if python_files:
-                # Try mypy for type checking
-                try:
-                    result = subprocess.run(
-                        ["python", "-m", "mypy"] + python_files,
-                        cwd=self.repo_path,
-                        capture_output=True,
-                        text=True,
-                        timeout=60
-                    )
-
-                    if result.returncode == 0:
-                        logger.info("✅ Python type checking (mypy) passed")
-                        validation_passed = True
-                    else:
-                        # Check if mypy is actually installed
-                        if "No module named mypy" in result.stderr:
-                            logger.debug("mypy not installed - skipping Python type checking")
-                        else:
-                            # Collect error output
-                            error_msg = "=== Python type checking (mypy) failed ===\n"
-                            if result.stdout:
-                                error_msg += f"STDOUT:\n{result.stdout}\n"
-                            if result.stderr:
-                                error_msg += f"STDERR:\n{result.stderr}\n"
-                            collected_errors.append(error_msg)
-
-                            logger.warning(f"❌ Python type checking failed:")
-                            logger.warning(f"STDERR: {result.stderr[:500]}")
-                            return False, "\n".join(collected_errors)
-
-                except FileNotFoundError:
-                    logger.debug("Python or mypy not available")
-                except subprocess.TimeoutExpired:
-                    logger.warning("Python validation timed out")
-
-        # If we attempted validation but nothing passed, and we didn't find explicit errors,
-        # assume validation tools aren't configured for this project
-        if validation_attempted and not validation_passed:
-            logger.info("No validation tools succeeded, but no explicit code errors found")
+                # Try mypy for type checking. The persistent SQLite cache means the
+                # re-validation after a fix attempt only re-analyzes modified modules
+                mypy_cache = self._tool_cache_dir("mypy")
+                validation_jobs.append(ValidationJob(
+                    description="Python type checking (mypy)",
+                    command=[
+                        "python", "-m", "mypy",
+                        "--cache-dir", str(mypy_cache),
+                        "--sqlite-cache",
+                        "--follow-imports=silent",  # Only report errors in the changed files
+                        "--no-pretty",
+                    ] + python_files,
+                    cwd=self.repo_path,
+                    timeout=60,
+                    missing_markers=("no module named mypy",),
+                ))
+
+        if not validation_jobs:
+            logger.info("No validation tools available for this project")
             logger.info("Relying on Aider's auto_lint which runs during development")
             return True, ""
 
-        # If we found explicit errors, we already returned False above with errors
-        # If validation passed, return True with no errors
-        # If we didn't attempt validation, return True (no validators available)
+        # Checkers are independent processes - run them concurrently so polyglot
+        # repos wait for the slowest one instead of the sum of all of them
+        processes: dict[str, subprocess.Popen] = {}
+        cancel = threading.Event()
+        lock = threading.Lock()
+        executor = ThreadPoolExecutor(max_workers=len(validation_jobs), thread_name_prefix="dog-validate")
+        try:
+            futures = [
+                executor.submit(self._run_validation_job, job, processes, cancel, lock)
+                for job in validation_jobs
+            ]
+            for future in as_completed(futures):
+                error_msg = future.result()
+                if error_msg:
+                    # Real validation failure - stop the other checkers (and keep any
+                    # that haven't started from starting) and return the errors
+                    with lock:
+                        cancel.set()
+                        for process in processes.values():
+                            if process.poll() is None:
+                                process.terminate()
+                    return False, error_msg
+        finally:
+            # Terminated checkers exit on their own - don't wait for them
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # No explicit code errors found: either validation passed, or the tools
+        # aren't configured for this project (don't block on non-code issues)
         return True, ""
 
-    def _commit_changes(self, message: str) -> None:
+    def _ensure_node_dependencies(self) -> bool:
         """
-        Commit all current changes with given message.
+        Install npm dependencies unless node_modules already matches the lockfile.
 
-        Args:
-            message: Commit message
+        The lockfile hash from the last successful install is stored in
+        node_modules/.dogwalker_install_hash, so repeat validations skip the install.
+
+        Returns:
+            True if node_modules is usable, False if installation failed
         """
-        import subprocess
+        node_modules = self.repo_path / "node_modules"
+        marker = node_modules / ".dogwalker_install_hash"
+
+        lockfile = next((self.repo_path / name for name in NODE_LOCKFILES if (self.repo_path / name).is_file()), None)
+        lock_hash = hashlib.sha256(lockfile.read_bytes()).hexdigest() if lockfile else None
+
+        if node_modules.exists():
+            try:
+                if lock_hash is None or marker.read_text().strip() == lock_hash:
+                    return True
+            except OSError:
+                # No marker: installed outside Dogwalker - trust it rather than reinstalling
+                return True
+            logger.info(f"{lockfile.name} changed since last install - reinstalling dependencies...")
+        else:
+            logger.info("node_modules not found - installing dependencies first...")
+
+        # The install replaces node_modules under a dev server left running from the
+        # before screenshots - stop it so the after screenshots start a fresh one
+        if self.screenshot_tools and self.screenshot_tools.is_dev_server_running():
+            logger.info("Stopping dev server before reinstalling its dependencies")
+            self.screenshot_tools.stop_dev_server()
+
+        # npm ci is much faster than npm install, but requires package-lock.json
+        if lockfile is not None and lockfile.name == "package-lock.json":
+            command = ["npm", "ci", "--prefer-offline", "--no-audit", "--no-fund"]
+        else:
+            command = ["npm", "install", "--no-audit", "--no-fund"]
 
         try:
-            # Check if there are any changes to commit
-            status_result = subprocess.run(
-                ["git", "status", "--porcelain"],
+            install_result = subprocess.run(
+                command,
                 cwd=self.repo_path,
                 capture_output=True,
                 text=True,
-                timeout=10
+                timeout=180  # 3 minutes max
             )
+            if install_result.returncode != 0:
+                logger.warning(f"{' '.join(command[:2])} failed: {install_result.stderr[:500]}")
+                logger.info("Skipping Node.js validation due to dependency issues")
+                return False
+            logger.info(f"✅ {' '.join(command[:2])} completed successfully")
+        except subprocess.TimeoutExpired:
+            logger.warning("npm install timed out - skipping Node.js validation")
+            return False
+        except Exception as e:
+            logger.warning(f"npm install error: {e} - skipping Node.js validation")
+            return False
 
-            if not status_result.stdout.strip():
-                logger.info("No changes to commit - skipping commit")
-                return
+        if lock_hash is not None:
+            try:
+                marker.write_text(lock_hash)
+            except OSError as e:
+                logger.debug(f"Could not write install marker: {e}")
+        return True
 
-            # Stage all changes
-            subprocess.run(
-                ["git", "add", "-A"],
-                cwd=self.repo_path,
-                check=True,
-                timeout=10
-            )
+    def _run_validation_job(
+        self,
+        job: ValidationJob,
+        processes: dict[str, subprocess.Popen],
+        cancel: threading.Event,
+        lock: threading.Lock
+    ) -> Optional[str]:
+        """
+        Run one compile/type-check command.
+
+        Args:
+            job: Validation command to run
+            processes: Shared map of running processes, so a failing job can stop the others
+            cancel: Set once another job has failed; the command is then not started
+            lock: Guards processes and cancel, so no process starts after the others are stopped
+
+        Returns:
+            Formatted error output if the check found code errors, None otherwise
+            (passed, tool not available, timed out, or terminated)
+        """
+        with lock:
+            if cancel.is_set():
+                return None
+            try:
+                process = subprocess.Popen(
+                    job.command,
+                    cwd=job.cwd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True
+                )
+            except FileNotFoundError:
+                logger.debug(f"{job.description} command not found")
+                return None
+            processes[job.description] = process
+
+        try:
+            stdout, stderr = process.communicate(timeout=job.timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            logger.warning(f"{job.description} timed out")
+            return None
+
+        if process.returncode == 0:
+            logger.info(f"✅ {job.description} passed")
+            return None
+
+        if process.returncode < 0:
+            # Terminated because another checker already failed
+            return None
+
+        # Check if this is a real code error vs missing command
+        stderr_lower = stderr.lower()
+        if any(marker in stderr_lower for marker in job.missing_markers):
+            logger.debug(f"{job.description} not available in this project")
+            return None
+
+        # Collect error output
+        error_msg = f"=== {job.description} failed ===\n"
+        if stdout:
+            error_msg += f"STDOUT:\n{stdout}\n"
+        if stderr:
+            error_msg += f"STDERR:\n{stderr}\n"
+
+        logger.warning(f"❌ {job.description} failed:")
+        logger.warning(f"STDOUT: {stdout[:500]}")
+        logger.warning(f"STDERR: {stderr[:500]}")
+        return error_msg
+
+    def _find_local_tsc(self, project_dir: Path) -> Optional[Path]:
+        """
+        Find the project's installed tsc binary (project dir first, then hoisted to the repo root).
+
+        Args:
+            project_dir: TypeScript project directory
+
+        Returns:
+            Path to node_modules/.bin/tsc, or None if TypeScript isn't installed
+        """
+        for root in (project_dir, self.repo_path):
+            tsc = root / "node_modules" / ".bin" / "tsc"
+            if tsc.exists():
+                return tsc
+        return None
+
+    def _tool_cache_dir(self, tool: str) -> Path:
+        """
+        Get (and create) a persistent cache directory for a validation tool.
+
+        Lives under .git/ so it survives repeat validations of this clone without
+        ever showing up as a change to commit.
+
+        Args:
+            tool: Tool name (e.g., "tsc", "mypy")
+
+        Returns:
+            Cache directory path
+        """
+        cache_dir = self.repo_path / ".git" / "dogwalker" / tool
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir
+
+    def _package_scripts(self, project_dir: Path) -> dict[str, str]:
+        """
+        Read the npm scripts defined in a project's package.json.
+
+        Args:
+            project_dir: Directory to look for package.json in (falls back to repo root)
+
+        Returns:
+            Script name -> command mapping (empty if package.json is missing or invalid)
+        """
+        for package_json in (project_dir / "package.json", self.repo_path / "package.json"):
+            try:
+                with open(package_json) as f:
+                    return json.load(f).get("scripts", {}) or {}
+            except (OSError, ValueError):
+                continue
+        return {}
+
+    def _commit_changes(self, message: str) -> None:
+        """
+        Commit all current changes with given message.
+
+        Args:
+            message: Commit message
+        """
+        try:
+            # With pygit2 the clean-tree check is in-process; without it, let
+            # `git commit` report "nothing to commit" instead of running git status
+            if pygit2:
+                status = self._pygit2_status()
+                if not status:
+                    logger.info("No changes to commit - skipping commit")
+                    return
+                has_untracked = any(flags & pygit2.GIT_STATUS_WT_NEW for flags in status.values())
+            else:
+                has_untracked = True  # Unknown without a status call - stage everything
+
+            # `commit -a` stages edits and deletions of tracked files itself; only new
+            # files Aider created need a separate `git add -A`
+            if has_untracked:
+                subprocess.run(
+                    ["git", "add", "-A"],
+                    cwd=self.repo_path,
+                    check=True,
+                    timeout=10
+                )
 
             # Commit
-            subprocess.run(
-                ["git", "commit", "-m", message],
+            commit_result = subprocess.run(
+                ["git", "commit", "-a", "-m", message],
                 cwd=self.repo_path,
-                check=True,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
                 timeout=10
             )
-
+            if commit_result.returncode != 0:
+                if "nothing to commit" in commit_result.stdout:
+                    logger.info("No changes to commit - skipping commit")
+                    return
+                raise subprocess.CalledProcessError(
+                    commit_result.returncode, commit_result.args, commit_result.stdout, commit_result.stderr
+                )
+
+            self._changed_files_cache = None
             logger.info(f"✅ Changes committed: {message}")
 
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to commit changes: {e}")
             raise
 
-    def _get_recently_changed_files(self) -> list[str]:
+    def _uncommitted_changes(self) -> list[str]:
         """
-        Get list of files changed in recent commits.
+        Get paths with uncommitted changes (like `git status --porcelain`).
 
         Returns:
             List of file paths relative to repo root
         """
+        if pygit2:
+            return sorted(self._pygit2_status())
+
+        # -z keeps paths unquoted and lists a rename as "XY new" followed by "old"
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "-z"],
+            cwd=self.repo_path,
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=10
+        )
+        paths = []
+        entries = iter(result.stdout.split("\0"))
+        for entry in entries:
+            if not entry:
+                continue
+            paths.append(entry[3:])
+            if "R" in entry[:2] or "C" in entry[:2]:
+                next(entries, None)  # Skip the rename/copy source path
+        return paths
+
+    def _pygit2_status(self) -> dict[str, int]:
+        """
+        Read working tree status in-process (requires pygit2).
+
+        Returns:
+            Mapping of changed path -> pygit2 GIT_STATUS_* flags (unchanged and ignored paths omitted)
+        """
+        repo = pygit2.Repository(str(self.repo_path))
+        return {
+            path: flags for path, flags in repo.status().items()
+            if flags != pygit2.GIT_STATUS_CURRENT and not flags & pygit2.GIT_STATUS_IGNORED
+        }
+
+    def _recent_commits(self, count: int) -> list[str]:
+        """
+        Get one-line summaries of the latest commits (like `git log --oneline`).
+
+        Args:
+            count: Number of commits to return
+
+        Returns:
+            List of "<short sha> <subject>" strings, newest first
+        """
+        if pygit2:
+            repo = pygit2.Repository(str(self.repo_path))
+            if repo.head_is_unborn:
+                return []
+            return [
+                f"{commit.short_id} {commit.message.splitlines()[0] if commit.message else ''}"
+                for commit in itertools.islice(repo.walk(repo.head.target), count)
+            ]
+
+        result = subprocess.run(
+            ["git", "log", "--oneline", f"-{count}"],
+            cwd=self.repo_path,
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=10
+        )
+        return result.stdout.splitlines()
+
+    def _recent_changes_diff(self, count: int = 3) -> str:
+        """
+        Get the patches of the latest commits (like `git log -p`), truncated.
+
+        Args:
+            count: Number of commits to include
+
+        Returns:
+            Patch text, newest commit first, capped at MAX_HANG_DIFF_CHARS
+            (empty if git fails)
+        """
+        try:
+            result = subprocess.run(
+                ["git", "log", "-p", f"-{count}", "--format=commit %h %s"],
+                cwd=self.repo_path,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"Could not collect recent diff: {e}")
+            return ""
+
+        if result.returncode != 0:
+            return ""
+        diff = result.stdout
+        if len(diff) > MAX_HANG_DIFF_CHARS:
+            diff = diff[:MAX_HANG_DIFF_CHARS] + "\n... (diff truncated)"
+        return diff
+
+    def _hang_suspect_snippets(self, count: int = 3) -> str:
+        """
+        Find lines likely to hang compilation in the files the latest commits touched.
+
+        Greps the changed JS/TS files for HANG_SUSPECT_PATTERNS with `git grep`
+        (multithreaded, and unlike ripgrep always present on workers).
+
+        Args:
+            count: Number of recent commits whose files are searched
+
+        Returns:
+            "path:line:code" lines (at most MAX_HANG_SNIPPETS_PER_FILE per file and
+            MAX_HANG_SNIPPETS overall), empty if nothing matched or git fails
+        """
         try:
-            import subprocess
-            import os
+            changed = subprocess.run(
+                ["git", "log", "--name-only", f"-{count}", "--format="],
+                cwd=self.repo_path,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=10
+            )
+            files = [
+                path for path in dict.fromkeys(changed.stdout.splitlines())
+                if path.endswith(HANG_SUSPECT_EXTENSIONS) and (self.repo_path / path).is_file()
+            ]
+            if changed.returncode != 0 or not files:
+                return ""
+
+            patterns = [arg for pattern in HANG_SUSPECT_PATTERNS for arg in ("-e", pattern)]
+            result = subprocess.run(
+                ["git", "grep", "-n", "-I", "-E", *patterns, "--", *files],
+                cwd=self.repo_path,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"Could not search for hang suspects: {e}")
+            return ""
 
-            old_cwd = os.getcwd()
-            os.chdir(self.repo_path)
+        per_file: dict[str, int] = defaultdict(int)
+        snippets = []
+        for line in result.stdout.splitlines():
+            path = line.split(":", 1)[0]
+            if per_file[path] >= MAX_HANG_SNIPPETS_PER_FILE:
+                continue
+            per_file[path] += 1
+            snippets.append(line[:200])
+            if len(snippets) >= MAX_HANG_SNIPPETS:
+                break
+        return "\n".join(snippets)
+
+    def _head_commit(self) -> Optional[str]:
+        """
+        Get the SHA of the current HEAD commit.
 
-            # Get files from recent commits (works with fresh clones that have <10 commits)
-            # Using git log instead of git diff to avoid "HEAD~10 doesn't exist" errors
+        Returns:
+            Commit SHA, or None if there are no commits yet or git fails
+        """
+        try:
             result = subprocess.run(
-                ["git", "log", "--name-only", "--pretty=format:", "-10"],
+                ["git", "rev-parse", "--verify", "HEAD"],
+                cwd=self.repo_path,
                 capture_output=True,
-                text=True,
+                encoding="utf-8",
+                errors="replace",
                 timeout=5
             )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def _files_changed_since(self, commit: Optional[str]) -> Optional[list[str]]:
+        """
+        Get every file that differs from a commit: committed, uncommitted, or untracked.
+
+        Args:
+            commit: Commit SHA to compare the working tree against
+
+        Returns:
+            Paths relative to the repo root, or None if the changes can't be determined
+        """
+        if not commit:
+            return None
+
+        try:
+            diff = subprocess.run(
+                ["git", "diff", "--name-only", commit, "--"],
+                cwd=self.repo_path,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=10
+            )
+            untracked = subprocess.run(
+                ["git", "ls-files", "--others", "--exclude-standard"],
+                cwd=self.repo_path,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug(f"Could not list files changed since {commit[:7]}: {e}")
+            return None
+
+        if diff.returncode != 0 or untracked.returncode != 0:
+            return None
+        return diff.stdout.splitlines() + untracked.stdout.splitlines()
+
+    def _get_recently_changed_files(self, coder: Optional[Coder] = None) -> list[str]:
+        """
+        Get list of files changed in recent commits.
 
-            os.chdir(old_cwd)
+        Prefers the files the given Aider Coder edited in this repo (already in
+        memory); otherwise reads the last 10 commits, memoized per HEAD commit so
+        phases that run between commits (e.g. self-review and test writing) share
+        one lookup.
 
-            if result.returncode == 0:
-                # Parse output and deduplicate files
-                files = list(set([f.strip() for f in result.stdout.strip().split('\n') if f.strip()]))
-                logger.info(f"Found {len(files)} changed files: {files}")
-                return files
+        Args:
+            coder: Coder whose edits to use, e.g. run_task's (optional)
+
+        Returns:
+            List of file paths relative to repo root, most recent first
+        """
+        # Worktree-phase coders are rooted elsewhere, so only trust a coder rooted here
+        edited = getattr(coder, "aider_edited_files", None)
+        if edited and Path(coder.root).resolve() == self.repo_path.resolve():
+            # aider_edited_files is an unordered set - order by modification time so
+            # the most recently edited files come first, as with the git paths below
+            def mtime(path: str) -> float:
+                try:
+                    return (self.repo_path / path).stat().st_mtime
+                except OSError:
+                    return 0.0  # Deleted since the edit
+
+            files = sorted(edited, key=mtime, reverse=True)[:MAX_REVIEW_FILES]
+            logger.info(f"Found {len(files)} files edited by Aider: {files}")
+            return files
+
+        try:
+            if pygit2:
+                repo = pygit2.Repository(str(self.repo_path))
+                head = None if repo.head_is_unborn else str(repo.head.target)
             else:
-                logger.warning(f"Failed to get changed files: {result.stderr}")
-                return []
+                repo = None
+                head_result = subprocess.run(
+                    ["git", "rev-parse", "HEAD"],
+                    cwd=self.repo_path,
+                    capture_output=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    timeout=5
+                )
+                head = head_result.stdout.strip() if head_result.returncode == 0 else None
+
+            cached = self._changed_files_cache
+            if head and cached and cached[0] == head:
+                return list(cached[1])
+
+            if repo is not None:
+                # Walk the last 10 commits in-process instead of forking `git log`
+                # dict keys dedupe while keeping most-recent-first order
+                files = {}
+                if head:
+                    for commit in itertools.islice(repo.walk(repo.head.target), 10):
+                        if len(commit.parents) > 1:
+                            continue  # Like `git log --name-only`, list no files for merges
+                        if commit.parents:
+                            diff = repo.diff(commit.parents[0], commit)
+                        else:
+                            diff = commit.tree.diff_to_tree(swap=True)
+                        files.update(dict.fromkeys(delta.new_file.path for delta in diff.deltas))
+                        if len(files) >= MAX_REVIEW_FILES:
+                            break
+                files = list(files)[:MAX_REVIEW_FILES]
+            else:
+                # Get files from recent commits (works with fresh clones that have <10 commits)
+                # Using git log instead of git diff to avoid "HEAD~10 doesn't exist" errors
+                # cwd= instead of os.chdir keeps this safe to call from worker threads
+                # Stream the output and stop reading once MAX_REVIEW_FILES unique paths are
+                # seen, so huge monorepo commits aren't buffered in full
+                # stderr is discarded: nothing drains it while stdout is streamed, so a
+                # chatty git could fill the pipe and block
+                process = subprocess.Popen(
+                    ["git", "log", "--name-only", "--pretty=format:", "-10"],
+                    cwd=self.repo_path,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    encoding="utf-8",
+                    errors="replace"
+                )
+                # Reading stdout blocks, so the 5s deadline is enforced by killing git;
+                # the loop then sees EOF
+                deadline = threading.Timer(5, process.kill)
+                deadline.start()
+                # dict keys dedupe while keeping most-recent-first order
+                seen: dict[str, None] = {}
+                try:
+                    for line in process.stdout:
+                        path = line.strip()
+                        if path:
+                            seen[path] = None
+                            if len(seen) >= MAX_REVIEW_FILES:
+                                process.terminate()
+                                break
+                finally:
+                    deadline.cancel()
+                    process.stdout.close()
+                process.wait(timeout=5)
+
+                if process.returncode != 0 and len(seen) < MAX_REVIEW_FILES:
+                    logger.warning(f"Failed to get changed files (git log exited with {process.returncode})")
+                    return []
+
+                files = list(seen)
+
+            logger.info(f"Found {len(files)} changed files: {files}")
+            if head:
+                self._changed_files_cache = (head, files)
+            return list(files)
 
         except Exception as e:
             logger.error(f"Error getting changed files: {e}")
             return []
 
-    def run_self_review(self) -> bool:
+    def _changed_file_paths(
+        self,
+        work_path: Path,
+        phase: str,
+        changed_files: Optional[list[str]] = None
+    ) -> Optional[list[str]]:
+        """
+        Get recently changed files as absolute paths under a working tree, for Aider fnames.
+
+        Args:
+            work_path: Repository or worktree root the paths should point into
+            phase: Phase name for logging (e.g., "review", "test")
+            changed_files: Repo-relative changed files, if already resolved (optional)
+
+        Returns:
+            Absolute file paths, or None if no changed files were found
+        """
+        if changed_files is None:
+            changed_files = self._get_recently_changed_files(self._task_coder)
+        if not changed_files:
+            logger.warning(f"No changed files found - {phase} may not work properly")
+            return None
+
+        work_prefix = f"{work_path}{os.sep}"
+        logger.info(f"Added {len(changed_files)} changed files to {phase} context")
+        return [work_prefix + f for f in changed_files]
+
+    def run_self_review(
+        self,
+        worktree_path: Optional[Path] = None,
+        changed_files: Optional[list[str]] = None
+    ) -> bool:
         """
         Run self-review on the code changes made.
 
         This runs after the initial task is complete and allows the AI
         to critique its own work and make improvements.
 
+        Args:
+            worktree_path: Git worktree to review in instead of repo_path (optional)
+            changed_files: Repo-relative files to review, if already resolved (optional)
+
         Returns:
             True if review completed (changes made or not), False on error
         """
         logger.info("Starting self-review of code changes")
 
-        # Get list of changed files to pass to Aider
-        changed_files = self._get_recently_changed_files()
-        if not changed_files:
-            logger.warning("No changed files found - review may not work properly")
-
         review_prompt = """
 Review the code changes in the files that have been added to this chat. Consider:
 
@@ -865,22 +2220,18 @@ IMPORTANT - Commit Strategy:
 - Use descriptive commit messages
 """
 
-        try:
-            # Change to repo directory
-            import os
-            old_cwd = os.getcwd()
-            os.chdir(self.repo_path)
+        work_path = worktree_path or self.repo_path
 
-            # Re-initialize Aider for review with changed files explicitly added
-            model = Model(self.model_name)
+        try:
+            # Re-initialize Aider for review with changed files explicitly added.
+            # Phases may run in parallel threads, so each gets its own IO
             io = InputOutput(yes=True)
+            changed_file_paths = self._changed_file_paths(work_path, "review", changed_files)
 
-            # Convert changed files to absolute paths
-            changed_file_paths = [str(self.repo_path / f) for f in changed_files] if changed_files else None
-
-            self.coder = Coder.create(
-                main_model=model,
+            coder = Coder.create(
+                main_model=self._model,
                 io=io,
+                repo=self._aider_repo(work_path, io),
                 fnames=changed_file_paths,  # Explicitly add changed files for review
                 read_only_fnames=None,  # No read-only restrictions
                 auto_commits=True,
@@ -889,43 +2240,35 @@ IMPORTANT - Commit Strategy:
                 auto_lint=False,  # Don't block on linter errors
             )
 
-            if changed_file_paths:
-                logger.info(f"Added {len(changed_file_paths)} changed files to review context")
-
             # Run review
-            result = self.coder.run(review_prompt)
+            result = coder.run(review_prompt)
 
             # Track Aider cost
-            if hasattr(self.coder, 'total_cost') and self.coder.total_cost:
-                aider_cost = self.coder.total_cost
-                self.total_cost += aider_cost
-                self.cost_breakdown["self_review"] += aider_cost
-                logger.info(f"Aider self-review cost: ${aider_cost:.4f} - Total cost: ${self.total_cost:.4f}")
+            self._track_aider_cost(coder, "self_review", "self-review")
 
             logger.info("Self-review completed")
-            os.chdir(old_cwd)
             return True
 
         except Exception as e:
             logger.exception(f"Self-review failed: {e}")
-            os.chdir(old_cwd)
             # Don't fail the whole task if review fails
             return True
 
-    def write_and_run_tests(self) -> tuple[bool, str]:
+    def write_and_run_tests(self, changed_files: Optional[list[str]] = None) -> tuple[bool, str]:
         """
         Write comprehensive tests and run them.
 
+        Always runs in repo_path, where the project's installed dependencies,
+        virtualenv and .env files live - a fresh worktree has none of them.
+
+        Args:
+            changed_files: Repo-relative files to test, if already resolved (optional)
+
         Returns:
             Tuple of (success, output/error message)
         """
         logger.info("Writing comprehensive tests")
 
-        # Get list of changed files to pass to Aider
-        changed_files = self._get_recently_changed_files()
-        if not changed_files:
-            logger.warning("No changed files found - test writing may not work properly")
-
         test_prompt = """
 Write comprehensive tests for the code changes in the files that have been added to this chat. Follow these guidelines:
 
@@ -958,50 +2301,243 @@ IMPORTANT - Commit Strategy:
 - Use descriptive commit messages
 """
 
-        try:
-            # Change to repo directory
-            import os
-            old_cwd = os.getcwd()
-            os.chdir(self.repo_path)
+        work_path = self.repo_path
 
-            # Re-initialize Aider for test writing with changed files explicitly added
-            model = Model(self.model_name)
+        try:
+            # Re-initialize Aider for test writing with changed files explicitly added.
+            # Phases may run in parallel threads, so each gets its own IO
             io = InputOutput(yes=True)
+            changed_file_paths = self._changed_file_paths(work_path, "test", changed_files)
 
-            # Convert changed files to absolute paths
-            changed_file_paths = [str(self.repo_path / f) for f in changed_files] if changed_files else None
-
-            self.coder = Coder.create(
-                main_model=model,
+            coder = Coder.create(
+                main_model=self._model,
                 io=io,
+                repo=self._aider_repo(work_path, io),
                 fnames=changed_file_paths,  # Explicitly add changed files for testing
                 auto_commits=True,
                 map_tokens=self.map_tokens,
                 edit_format="diff",
             )
 
-            if changed_file_paths:
-                logger.info(f"Added {len(changed_file_paths)} changed files to test context")
-
             # Write and run tests
-            result = self.coder.run(test_prompt)
+            result = coder.run(test_prompt)
 
             # Track Aider cost
-            if hasattr(self.coder, 'total_cost') and self.coder.total_cost:
-                aider_cost = self.coder.total_cost
-                self.total_cost += aider_cost
-                self.cost_breakdown["testing"] += aider_cost
-                logger.info(f"Aider testing cost: ${aider_cost:.4f} - Total cost: ${self.total_cost:.4f}")
+            self._track_aider_cost(coder, "testing", "testing")
 
             logger.info("Tests written and validated")
-            os.chdir(old_cwd)
             return True, "Tests written and passing"
 
         except Exception as e:
             logger.exception(f"Test writing/running failed: {e}")
-            os.chdir(old_cwd)
             return False, f"Test failure: {str(e)}"
 
+    def run_review_and_tests_concurrently(self) -> tuple[bool, str]:
+        """
+        Run self-review and test writing at the same time.
+
+        Only self-review runs in a separate worktree. Test writing needs the
+        project's installed dependencies (node_modules, virtualenv, .env) to run
+        the tests, so it works directly in repo_path on the task branch.
+        Self-review only edits source, so it gets a detached git worktree at HEAD;
+        its commits are merged back into the task branch once both phases finish.
+        Each phase has its own Aider Coder and IO. If that merge
+        conflicts, self-review is re-run sequentially on the merged tree instead.
+
+        Returns:
+            Tuple of (success, output/error message) from test writing
+        """
+        # Resolved once here - the phase threads must not read shared Coder state
+        changed_files = self._get_recently_changed_files(self._task_coder)
+        if not changed_files:
+            # Unscoped phases may each edit anything, so run them in sequence
+            # rather than risk conflicting merges (or shared Aider state)
+            logger.info("No changed files to scope phases - running review and tests sequentially")
+            self.run_self_review()
+            return self.write_and_run_tests()
+
+        worktrees_root = Path(tempfile.mkdtemp(prefix="dogwalker-worktrees-"))
+        review_path = worktrees_root / "review"
+
+        try:
+            subprocess.run(
+                ["git", "worktree", "add", "--detach", str(review_path), "HEAD"],
+                cwd=self.repo_path,
+                check=True,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=30
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Could not set up review worktree ({e}) - running review and tests sequentially")
+            shutil.rmtree(worktrees_root, ignore_errors=True)
+            self.run_self_review()
+            return self.write_and_run_tests()
+
+        try:
+            logger.info("Running self-review (in a worktree) and test writing concurrently")
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="dog-phase") as executor:
+                review_future = executor.submit(self.run_self_review, review_path, changed_files)
+                tests_future = executor.submit(self.write_and_run_tests, changed_files)
+                review_future.result()
+                test_result = tests_future.result()
+
+            try:
+                merged = self._merge_worktree(review_path, "self-review")
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+                logger.warning(f"Could not merge self-review changes ({e})")
+                merged = False
+            if not merged:
+                self.run_self_review()
+
+            return test_result
+
+        finally:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", str(review_path)],
+                cwd=self.repo_path,
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=30
+            )
+            shutil.rmtree(worktrees_root, ignore_errors=True)
+
+    def _merge_worktree(self, worktree_path: Path, label: str) -> bool:
+        """
+        Merge the commits made in a phase worktree back into the task branch.
+
+        Args:
+            worktree_path: Worktree created by run_review_and_tests_concurrently
+            label: Phase name for the merge commit message and logs
+
+        Returns:
+            True if merged (or nothing to merge), False if the merge conflicted
+        """
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=worktree_path,
+            check=True,
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=10
+        ).stdout.strip()
+
+        merge = subprocess.run(
+            ["git", "merge", "--no-ff", "-m", f"Merge {label} changes", head],
+            cwd=self.repo_path,
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=30
+        )
+
+        if merge.returncode != 0:
+            logger.warning(f"Merging {label} changes conflicted - will re-run {label} sequentially")
+            logger.warning(f"STDOUT: {merge.stdout[:500]}")
+            subprocess.run(["git", "merge", "--abort"], cwd=self.repo_path, capture_output=True, timeout=10)
+            return False
+
+        logger.info(f"✅ Merged {label} changes from worktree")
+        return True
+
+    def _build_image_markdown(
+        self,
+        image_files: Optional[list[str]],
+        image_github_urls: Optional[dict[str, str]]
+    ) -> str:
+        """
+        Render reference images as markdown for PR descriptions.
+
+        Memoized per (image_files, image_github_urls), so the final PR description
+        reuses the draft's result.
+
+        Args:
+            image_files: List of image file paths (optional)
+            image_github_urls: Mapping of local image paths to GitHub URLs (optional)
+
+        Returns:
+            Markdown image tags, one per existing image (empty if none)
+        """
+        if not image_files:
+            return ""
+
+        key = (tuple(image_files), tuple(sorted((image_github_urls or {}).items())))
+        if key in self._image_markdown:
+            return self._image_markdown[key]
+
+        image_markdown = ""
+        for img_path_obj in self._list_existing_images(image_files):
+            img_path = str(img_path_obj)
+            try:
+                # Use GitHub URL if available, otherwise fall back to relative path
+                if image_github_urls and img_path in image_github_urls:
+                    image_url = image_github_urls[img_path]
+                    logger.info(f"Using GitHub URL for image: {image_url}")
+                else:
+                    # Fallback to relative path (for backwards compatibility)
+                    image_url = self._repo_relative(img_path)
+                    logger.warning(f"No GitHub URL found for {img_path}, using relative path")
+
+                # Use markdown image syntax
+                image_markdown += f'\n![{img_path_obj.name}]({image_url})\n'
+            except Exception as e:
+                logger.error(f"Failed to process image {img_path}: {e}")
+
+        self._image_markdown[key] = image_markdown
+        return image_markdown
+
+    def _repo_relative(self, path: str) -> str:
+        """
+        Convert an absolute path inside the repo to a repo-relative one.
+
+        Args:
+            path: Absolute file path
+
+        Returns:
+            Path relative to repo_path
+
+        Raises:
+            ValueError: If path is not inside repo_path
+        """
+        if path.startswith(self._repo_prefix):
+            return path[len(self._repo_prefix):]
+        # Unnormalized input (e.g. "..", duplicate separators) - let pathlib decide
+        return str(Path(path).relative_to(self.repo_path))
+
+    def _list_existing_images(self, image_files: list[str]) -> list[Path]:
+        """
+        Filter image paths down to those that exist on disk.
+
+        Scans each image directory (e.g. `.dogwalker_images/`) once with
+        os.scandir and caches the listing, instead of stat-ing every file.
+
+        Args:
+            image_files: List of image file paths
+
+        Returns:
+            Existing image paths, in the original order
+        """
+        img_paths = [Path(img) for img in image_files]
+
+        # List any directories not seen yet (in practice just .dogwalker_images/)
+        for directory in dict.fromkeys(p.parent for p in img_paths):
+            if directory not in self._image_dir_entries:
+                self._image_dir_entries[directory] = self._list_dir_names(directory)
+
+        return [p for p in img_paths if p.name in self._image_dir_entries[p.parent]]
+
+    @staticmethod
+    def _list_dir_names(directory: Path) -> frozenset[str]:
+        """List entry names in a directory (empty if it can't be read)."""
+        try:
+            with os.scandir(directory) as it:
+                return frozenset(entry.name for entry in it)
+        except OSError:
+            return frozenset()
+
     def generate_draft_pr_description(
         self,
         task_description: str,
@@ -1028,26 +2564,7 @@ IMPORTANT - Commit Strategy:
         logger.info("Generating draft PR description")
 
         # Convert images to markdown using GitHub URLs if available
-        image_markdown = ""
-        if image_files:
-            for img_path in image_files:
-                try:
-                    img_path_obj = Path(img_path)
-                    if img_path_obj.exists():
-                        # Use GitHub URL if available, otherwise fall back to relative path
-                        if image_github_urls and img_path in image_github_urls:
-                            image_url = image_github_urls[img_path]
-                            logger.info(f"Using GitHub URL for image: {image_url}")
-                        else:
-                            # Fallback to relative path (for backwards compatibility)
-                            relative_path = img_path_obj.relative_to(self.repo_path)
-                            image_url = str(relative_path)
-                            logger.warning(f"No GitHub URL found for {img_path}, using relative path")
-
-                        # Use markdown image syntax
-                        image_markdown += f'\n![{img_path_obj.name}]({image_url})\n'
-                except Exception as e:
-                    logger.error(f"Failed to process image {img_path}: {e}")
+        image_markdown = self._build_image_markdown(image_files, image_github_urls)
 
         # Build image section for prompt if images exist
         image_section = ""
@@ -1073,47 +2590,21 @@ Format the PR description as professional markdown with these sections:
 3. 📋 Request section with the task description (as a blockquote){" - Include the images AFTER the task description blockquote" if image_markdown else ""}
 4. 📅 When section showing when it was requested
 5. 🎯 Implementation Plan section with the plan
-
-End with:
----
-🚧 **This is a draft PR** - Implementation in progress...
-
-_This PR will be updated with changes and marked ready for review when complete._
-
----
-🤖 Generated with [Dogwalker AI](https://dogwalker.dev)
-
-Provide ONLY the markdown PR description. No explanations, no additional text."""
+"""
+        prompt = "".join((prompt, _DRAFT_PR_PROMPT_FOOT))
 
         try:
             return self.call_claude_api(prompt, max_tokens=1500, category="draft_pr_description")
         except Exception as e:
             logger.exception(f"Draft PR description generation failed: {e}")
             # Fallback to basic template
-            return f"""## 🐕 Dogwalker AI Task Report
-
-### 👤 Requester
-**{requester_name}** requested this change
-
-### 📋 Request
-> {task_description}
-
-{image_markdown if image_markdown else ""}
-
-### 📅 When
-Requested on **{request_time_str}**
-
-### 🎯 Implementation Plan
-{plan}
-
----
-
-🚧 **This is a draft PR** - Implementation in progress...
-
-_This PR will be updated with changes and marked ready for review when complete._
-
----
-🤖 Generated with [Dogwalker AI](https://dogwalker.dev)"""
+            return _DRAFT_PR_FALLBACK.substitute(
+                requester_name=requester_name,
+                task_description=task_description,
+                image_markdown=image_markdown,
+                request_time_str=request_time_str,
+                plan=plan,
+            )
 
     def generate_final_pr_description(
         self,
@@ -1128,8 +2619,8 @@ _This PR will be updated with changes and marked ready for review when complete.
         image_github_urls: Optional[dict[str, str]] = None,
         cost_report: Optional[dict[str, float]] = None,
         thread_feedback: Optional[str] = None,
-        before_screenshots: Optional[list[dict[str, str]]] = None,
-        after_screenshots: Optional[list[dict[str, str]]] = None,
+        before_screenshots: Optional[list[ShotInfo]] = None,
+        after_screenshots: Optional[list[ShotInfo]] = None,
     ) -> str:
         """
         Generate final PR description using Claude API.
@@ -1146,8 +2637,8 @@ _This PR will be updated with changes and marked ready for review when complete.
             image_github_urls: Map of local paths to GitHub URLs (optional)
             cost_report: API cost breakdown (optional, dict with "total_cost" and "breakdown")
             thread_feedback: Markdown-formatted list of thread messages (optional)
-            before_screenshots: List of before screenshot dicts (optional)
-            after_screenshots: List of after screenshot dicts (optional)
+            before_screenshots: List of before screenshots (optional)
+            after_screenshots: List of after screenshots (optional)
 
         Returns:
             Complete final PR description in markdown
@@ -1155,26 +2646,7 @@ _This PR will be updated with changes and marked ready for review when complete.
         logger.info("Generating final PR description")
 
         # Convert images to markdown using GitHub URLs if available
-        image_markdown = ""
-        if image_files:
-            for img_path in image_files:
-                try:
-                    img_path_obj = Path(img_path)
-                    if img_path_obj.exists():
-                        # Use GitHub URL if available, otherwise fall back to relative path
-                        if image_github_urls and img_path in image_github_urls:
-                            image_url = image_github_urls[img_path]
-                            logger.info(f"Using GitHub URL for image: {image_url}")
-                        else:
-                            # Fallback to relative path (for backwards compatibility)
-                            relative_path = img_path_obj.relative_to(self.repo_path)
-                            image_url = str(relative_path)
-                            logger.warning(f"No GitHub URL found for {img_path}, using relative path")
-
-                        # Use markdown image syntax
-                        image_markdown += f'\n![{img_path_obj.name}]({image_url})\n'
-                except Exception as e:
-                    logger.error(f"Failed to process image {img_path}: {e}")
+        image_markdown = self._build_image_markdown(image_files, image_github_urls)
 
         files_list = "\n".join([f"- `{f}`" for f in files_modified]) if files_modified else "_File changes were committed automatically by the AI agent_"
 
@@ -1190,15 +2662,12 @@ _This PR will be updated with changes and marked ready for review when complete.
             total_cost = cost_report.get("total_cost", 0.0)
             breakdown = cost_report.get("breakdown", {})
 
-            # Format breakdown
-            breakdown_lines = []
-            for category, cost in breakdown.items():
-                if cost > 0:
-                    # Format category name (convert snake_case to Title Case)
-                    category_name = category.replace("_", " ").title()
-                    breakdown_lines.append(f"  - {category_name}: ${cost:.4f}")
-
-            breakdown_text = "\n".join(breakdown_lines) if breakdown_lines else "  - No breakdown available"
+            # Format breakdown (category names converted from snake_case to Title Case)
+            breakdown_text = "\n".join(
+                f"  - {category.replace('_', ' ').title()}: ${cost:.4f}"
+                for category, cost in breakdown.items()
+                if cost > 0
+            ) or "  - No breakdown available"
 
             cost_section = f"""
 
@@ -1231,21 +2700,21 @@ Images provided (include these AFTER the task description in the Request section
 {image_markdown}
 """
 
+        # Resolve before/after screenshot URLs once for both the prompt and the fallback
+        screenshot_pairs = self._screenshot_pairs(before_screenshots, after_screenshots)
+
         # Format before/after screenshots section if available
         screenshots_context = ""
-        if before_screenshots and after_screenshots:
-            screenshots_context = "\n\nBefore/After Screenshots:"
-            for i, (before, after) in enumerate(zip(before_screenshots, after_screenshots), 1):
-                # Use GitHub URLs if available, fall back to relative paths
-                before_url = before.get('github_url') or str(Path(before['path']).relative_to(self.repo_path))
-                after_url = after.get('github_url') or str(Path(after['path']).relative_to(self.repo_path))
-                page_url = before.get('url', 'Unknown page')
-                screenshots_context += f"""
+        if screenshot_pairs:
+            screenshots_context = "\n\nBefore/After Screenshots:" + "".join(
+                f"""
 
 Page: {page_url}
 Before: ![]({before_url})
 After: ![]({after_url})
 """
+                for page_url, before_url, after_url in screenshot_pairs
+            )
 
         prompt = f"""Generate a professional GitHub pull request description for completed work.
 
@@ -1279,14 +2748,8 @@ Format the PR description as professional markdown with these sections:
    - All code changes validated before submission
 11. ⏱️ Task Duration section
 12. 💰 API Cost section{cost_section if cost_report else " (SKIP if no cost data provided)"}
-
-End with:
----
-🤖 Generated with [Dogwalker AI](https://dogwalker.dev)
-
-Co-Authored-By: Claude <noreply@anthropic.com>
-
-Provide ONLY the markdown PR description. Be professional and concise."""
+"""
+        prompt = "".join((prompt, _FINAL_PR_PROMPT_FOOT))
 
         try:
             return self.call_claude_api(prompt, max_tokens=2000, category="final_pr_description")
@@ -1307,14 +2770,9 @@ The following feedback was provided during implementation:
 
             # Format before/after screenshots section for fallback template
             screenshots_section = ""
-            if before_screenshots and after_screenshots:
-                screenshots_section = "\n\n### 📸 Visual Changes\n\n"
-                for i, (before, after) in enumerate(zip(before_screenshots, after_screenshots), 1):
-                    # Use GitHub URLs if available, fall back to relative paths
-                    before_url = before.get('github_url') or str(Path(before['path']).relative_to(self.repo_path))
-                    after_url = after.get('github_url') or str(Path(after['path']).relative_to(self.repo_path))
-                    page_url = before.get('url', 'Unknown page')
-                    screenshots_section += f"""
+            if screenshot_pairs:
+                screenshots_section = "\n\n### 📸 Visual Changes\n\n" + "".join(
+                    f"""
 **Page: {page_url}**
 
 | Before | After |
@@ -1322,42 +2780,52 @@ The following feedback was provided during implementation:
 | ![]({before_url}) | ![]({after_url}) |
 
 """
+                    for page_url, before_url, after_url in screenshot_pairs
+                )
 
             # Fallback to basic template
-            return f"""## 🐕 Dogwalker AI Task Report
-
-### 👤 Requester
-**{requester_name}** requested this change
-
-### 📋 Request
-> {task_description}
-
-{image_markdown if image_markdown else ""}
-
-### 📅 When
-Requested on **{request_time_str}**
-
-### 🎯 Implementation Plan
-{plan}
-
-### 📝 Changes Made
-{files_list}
-{screenshots_section}{thread_feedback_section}{critical_section}
+            return _FINAL_PR_FALLBACK.substitute(
+                requester_name=requester_name,
+                task_description=task_description,
+                image_markdown=image_markdown,
+                request_time_str=request_time_str,
+                plan=plan,
+                files_list=files_list,
+                screenshots_section=screenshots_section,
+                thread_feedback_section=thread_feedback_section,
+                critical_section=critical_section,
+                duration_str=duration_str,
+                cost_section=cost_section,
+            )
 
-### ✅ Quality Assurance
-This PR has been:
-- Self-reviewed by the AI agent
-- Comprehensive tests written and verified passing
-- All code changes validated before submission
+    def _screenshot_pairs(
+        self,
+        before_screenshots: Optional[list[ShotInfo]],
+        after_screenshots: Optional[list[ShotInfo]]
+    ) -> list[tuple[str, str, str]]:
+        """
+        Pair up before/after screenshots and resolve their image URLs.
 
-### ⏱️ Task Duration
-Completed in **{duration_str}**
-{cost_section}
+        Args:
+            before_screenshots: List of before screenshots (optional)
+            after_screenshots: List of after screenshots (optional)
 
----
-🤖 Generated with [Dogwalker AI](https://dogwalker.dev)
+        Returns:
+            (page_url, before_url, after_url) per page (empty unless both lists are given)
+        """
+        if not before_screenshots or not after_screenshots:
+            return []
 
-Co-Authored-By: Claude <noreply@anthropic.com>"""
+        repo_relative = self._repo_relative
+        return [
+            (
+                before.url or 'Unknown page',
+                # Use GitHub URLs if available, fall back to relative paths
+                before.github_url or repo_relative(before.path),
+                after.github_url or repo_relative(after.path),
+            )
+            for before, after in zip(before_screenshots, after_screenshots)
+        ]
 
     def get_cost_report(self) -> dict[str, float]:
         """
@@ -1368,7 +2836,7 @@ Co-Authored-By: Claude <noreply@anthropic.com>"""
         """
         return {
             "total_cost": self.total_cost,
-            "breakdown": self.cost_breakdown.copy()
+            "breakdown": self.cost_breakdown.to_dict()
         }
 
     def ask_human(self, question: str, timeout: int = 600) -> Optional[str]:
@@ -1463,7 +2931,7 @@ Co-Authored-By: Claude <noreply@anthropic.com>"""
             logger.error(f"Web search failed: {e}")
             return None
 
-    def capture_before_screenshots(self, plan: str) -> list[dict[str, str]]:
+    def capture_before_screenshots(self, plan: str) -> list[ShotInfo]:
         """
         Take screenshots of the frontend page(s) BEFORE making any code changes.
 
@@ -1473,7 +2941,7 @@ Co-Authored-By: Claude <noreply@anthropic.com>"""
             plan: Implementation plan
 
         Returns:
-            List of screenshot info dicts with url, filename, path, github_url
+            ShotInfo per captured page (url, filename, path, github_url)
         """
         if not self.screenshot_tools:
             logger.warning("Cannot capture screenshots - no screenshot tools available")
@@ -1507,29 +2975,30 @@ Co-Authored-By: Claude <noreply@anthropic.com>"""
 
         # Capture screenshots
         logger.info(f"Capturing screenshots for {len(urls)} URLs...")
+        self._before_screenshots_head = self._head_commit()
         screenshots = self.screenshot_tools.capture_multiple_screenshots(urls, prefix="before_")
 
         if screenshots:
             logger.info(f"✅ Successfully captured {len(screenshots)} before screenshots")
             # Log GitHub URLs for verification
             for shot in screenshots:
-                github_url = shot.get('github_url')
+                github_url = shot.github_url
                 if github_url:
-                    logger.info(f"  - {shot['url']}: {github_url}")
+                    logger.info(f"  - {shot.url}: {github_url}")
                 else:
-                    logger.warning(f"  - {shot['url']}: GitHub upload failed, no URL available")
+                    logger.warning(f"  - {shot.url}: GitHub upload failed, no URL available")
         else:
             logger.error("❌ Failed to capture any screenshots")
 
-        # IMPORTANT: Stop the server now that we have before screenshots
-        # Aider will make large multi-file changes that break hot-reload
-        # We'll start a fresh server (with cache cleared) for "after" screenshots
-        logger.info("Stopping dev server before code changes (will restart fresh after changes complete)")
-        self.screenshot_tools.stop_dev_server()
+        # Leave the server running: its file watcher recompiles only what Aider
+        # touches, which is far cheaper than a cold start for the after screenshots.
+        # capture_after_screenshots falls back to a fresh restart if hot reload fails
+        if not screenshots:
+            self.screenshot_tools.stop_dev_server()
 
         return screenshots
 
-    def capture_after_screenshots(self, before_screenshots: list[dict[str, str]]) -> list[dict[str, str]]:
+    def capture_after_screenshots(self, before_screenshots: list[ShotInfo]) -> list[ShotInfo]:
         """
         Take screenshots of the frontend page(s) AFTER making ALL code changes.
 
@@ -1540,7 +3009,7 @@ Co-Authored-By: Claude <noreply@anthropic.com>"""
             before_screenshots: List of before screenshot info (used to get URLs)
 
         Returns:
-            List of after screenshot info dicts with url, filename, path, github_url
+            ShotInfo per captured page (url, filename, path, github_url)
         """
         if not self.screenshot_tools or not before_screenshots:
             if not before_screenshots:
@@ -1549,101 +3018,142 @@ Co-Authored-By: Claude <noreply@anthropic.com>"""
 
         logger.info("Capturing after screenshots to compare with before...")
 
-        # Server was stopped after "before" screenshots to avoid hot-reload issues
-        # Now start fresh with cleared cache for "after" screenshots
-        logger.info("Starting fresh dev server with new code (clearing cache to avoid compilation issues)...")
-        if not self.screenshot_tools.start_dev_server(clear_cache=True):
-            # Check if this was a compilation hang (specific error type)
-            if hasattr(self.screenshot_tools, 'last_error_type') and self.screenshot_tools.last_error_type == "compilation_hang":
-                logger.error("❌ Dev server failed due to compilation hang")
-                logger.info("🔧 Asking Aider to fix the compilation issues...")
+        # Same URLs as before, each once (a list: it's counted, logged, and iterated more than once)
+        urls = list(dict.fromkeys(map(attrgetter('url'), before_screenshots)))
+
+        # Pages no changed file can reach still look like their before screenshot - reuse those
+        changed_files = self._files_changed_since(self._before_screenshots_head)
+        if changed_files is not None:
+            urls = self.screenshot_tools.urls_affected_by(urls, changed_files)
+        reused = {shot.url: shot for shot in before_screenshots if shot.url not in urls}
+        if reused:
+            logger.info(f"♻️ Reusing before screenshots for pages the changes can't affect: {list(reused)}")
+
+        captured = {}
+        if urls:
+            # Reuse the dev server from the before screenshots if hot reload picked up the
+            # changes. Dependency and build-config changes always need a fresh server
+            needs_restart = changed_files is None or any(map(DEV_SERVER_RESTART_FILE_RE.search, changed_files))
+            if (
+                not needs_restart
+                and self.screenshot_tools.is_dev_server_running()
+                and self.screenshot_tools.wait_for_hmr_ready(urls, timeout=30)
+            ):
+                logger.info("♻️ Reusing running dev server (hot reload) for after screenshots")
+            elif not self._restart_dev_server_fresh():
+                return []
 
-                try:
-                    # Ask Aider to fix compilation hang issues
-                    fix_prompt = """
-The dev server is stuck during page compilation (>30s with no progress). This indicates a code bug.
+            logger.info(f"Capturing after screenshots for {len(urls)} URLs: {urls}")
+            after_shots = self.screenshot_tools.capture_multiple_screenshots(
+                urls, prefix="after_", previous=before_screenshots
+            )
+            captured = {shot.url: shot for shot in after_shots}
 
-Common causes and how to fix them:
+        # Keep the before order so _screenshot_pairs lines pages up
+        screenshots = [
+            reused.get(shot.url) or captured[shot.url]
+            for shot in before_screenshots
+            if shot.url in reused or shot.url in captured
+        ]
 
-1. **Infinite loops during render/SSR** - Code running during component render or module-level execution that never completes
-   - Check for while(true) loops without breaks
-   - Look for recursive function calls without base cases
-   - Check useEffect hooks with incorrect dependencies causing infinite re-renders
+        if screenshots:
+            logger.info(f"✅ Successfully captured {len(screenshots)} after screenshots")
+            # Log GitHub URLs for verification
+            for shot in screenshots:
+                github_url = shot.github_url
+                if github_url:
+                    logger.info(f"  - {shot.url}: {github_url}")
+                else:
+                    logger.warning(f"  - {shot.url}: GitHub upload failed, no URL available")
+        else:
+            logger.error("❌ Failed to capture any after screenshots")
 
-2. **Circular dependencies** - Modules importing each other in a loop
-   - Review import statements in recently changed files
-   - Break circular imports by moving shared code to separate modules
-   - Use dynamic imports for circular references
+        return screenshots
 
-3. **Heavy computation during module load** - Expensive operations running at import time
-   - Move computations inside functions or useEffect
-   - Defer heavy processing until after component mounts
-   - Use lazy loading for expensive modules
+    def _restart_dev_server_fresh(self) -> bool:
+        """
+        Restart the dev server with a cleared build cache for the after screenshots.
 
-4. **Syntax errors causing infinite compilation loops** - Malformed code that confuses the compiler
-   - Check for unclosed brackets, parentheses, or quotes
-   - Verify template literal syntax
-   - Check for missing semicolons or commas
+        If the restart fails because page compilation hangs, asks Aider to fix the
+        code and retries once.
 
-Please analyze the recently changed files and fix any code that could cause compilation to hang.
-Focus on files modified in the last few commits - those are the most likely culprits.
+        Returns:
+            True if the dev server is running with the new code, False otherwise
+        """
+        # Hot reload can't be relied on (server gone or wedged) - start fresh with cleared cache
+        self.screenshot_tools.stop_dev_server()
+        logger.info("Starting fresh dev server with new code (clearing cache to avoid compilation issues)...")
+        if not self.screenshot_tools.start_dev_server(clear_cache=True):
+            # Check if this was a compilation hang (specific error type)
+            if self.screenshot_tools.last_error_type == "compilation_hang":
+                logger.error("❌ Dev server failed due to compilation hang")
+                logger.info("🔧 Asking Aider to fix the compilation issues...")
 
-After fixing, ensure the code compiles successfully.
-"""
+                try:
+                    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="dog-hang-fix") as executor:
+                        # Collect the suspect commits' diff and hot spots concurrently
+                        snippets_future = executor.submit(self._hang_suspect_snippets)
+                        recent_diff = executor.submit(self._recent_changes_diff).result()
+                        hot_snippets = snippets_future.result()
+
+                    # Ask Aider to fix compilation hang issues. The context goes after
+                    # the constant prompt so the prompt prefix stays cacheable; no web
+                    # searches are needed for this fix.
+                    fix_prompt = _COMPILATION_HANG_FIX_PROMPT
+                    if hot_snippets:
+                        fix_prompt += (
+                            f"\nCheck these locations first (loops and effects in recently changed files):\n"
+                            f"<hot_snippets>\n{hot_snippets}\n</hot_snippets>\n"
+                        )
+                    if recent_diff:
+                        fix_prompt += f"\nRecent commits (most likely culprits):\n```diff\n{recent_diff}\n```\n"
 
                     # Use run_task with allow_no_changes=True since Aider might determine no changes needed
-                    result = self.run_task(fix_prompt, allow_no_changes=True)
+                    result = self.run_task(fix_prompt, allow_no_changes=True, search_queries=[])
 
                     if result:
                         logger.info("✅ Aider attempted fixes for compilation hang")
                         logger.info("🔄 Retrying dev server start after fixes...")
 
-                        # Retry starting dev server
-                        if self.screenshot_tools.start_dev_server(clear_cache=True):
+                        # Retry starting dev server, launching the screenshot browser while
+                        # the pages compile (closed again if the retry fails)
+                        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="dog-prewarm") as executor:
+                            executor.submit(self.screenshot_tools.prewarm_browser)
+                            started = self.screenshot_tools.start_dev_server(clear_cache=True)
+                        if started:
                             logger.info("✅ Dev server started successfully after fixes")
                         else:
+                            self.screenshot_tools.close_browser()
                             logger.error("❌ Dev server still failing after Aider fixes")
                             logger.error("Skipping after screenshots - manual intervention may be needed")
-                            return []
+                            return False
                     else:
                         logger.error("❌ Aider fix attempt failed")
-                        return []
+                        return False
 
                 except Exception as e:
                     logger.exception(f"Failed to fix compilation hang: {e}")
-                    return []
+                    return False
             else:
                 # Some other server start failure (not compilation hang)
                 logger.error("❌ Failed to start dev server - skipping after screenshots")
-                return []
+                return False
         logger.info("✅ Dev server started successfully with new code")
+        return True
 
-        # Capture same URLs as before
-        urls = [shot['url'] for shot in before_screenshots]
-        logger.info(f"Capturing after screenshots for {len(urls)} URLs: {urls}")
-        screenshots = self.screenshot_tools.capture_multiple_screenshots(urls, prefix="after_")
-
-        if screenshots:
-            logger.info(f"✅ Successfully captured {len(screenshots)} after screenshots")
-            # Log GitHub URLs for verification
-            for shot in screenshots:
-                github_url = shot.get('github_url')
-                if github_url:
-                    logger.info(f"  - {shot['url']}: {github_url}")
-                else:
-                    logger.warning(f"  - {shot['url']}: GitHub upload failed, no URL available")
-        else:
-            logger.error("❌ Failed to capture any after screenshots")
-
-        return screenshots
 
     def cleanup(self) -> None:
         """Clean up Aider resources."""
-        if self.coder:
+        if self.coder or self._task_coder:
             # Aider cleanup (if needed)
             self.coder = None
+            self._task_coder = None
             logger.info("Dog cleaned up successfully")
 
+        # Drop shared Aider model/IO so they can be garbage collected
+        self.__dict__.pop("_model", None)
+        self.__dict__.pop("_io", None)
+
         # Stop dev server if running
         if self.screenshot_tools:
             self.screenshot_tools.cleanup()
@@ -1,5 +1,7 @@
 """Dog communication helper for bi-directional Slack interaction."""
 
+import queue
+import threading
 import time
 import json
 import logging
@@ -7,8 +9,20 @@ import redis
 from typing import List, Dict, Optional
 from slack_sdk import WebClient
 
+try:
+    import orjson
+except ImportError:
+    # Optional: without orjson, thread messages are parsed with the stdlib json module
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Seconds the background Slack poster waits for more messages before exiting
+POSTER_IDLE_SECONDS = 30
+
+# Parser for Redis-stored thread messages (both raise a ValueError subclass on bad input)
+_loads_message = orjson.loads if orjson else json.loads
+
 
 class DogCommunication:
     """
@@ -48,9 +62,56 @@ class DogCommunication:
         self.redis_client = redis_client
         self.message_pointer = 0  # Track which messages we've read
 
+        # Updates are posted in order by a background thread so the dog never waits on Slack
+        self._post_queue: queue.Queue = queue.Queue()
+        self._poster: Optional[threading.Thread] = None
+        self._poster_lock = threading.Lock()
+
     def post_message(self, text: str, emoji: str = "🐕") -> bool:
         """
-        Post a message to the Slack thread.
+        Queue a message for the Slack thread; it is posted in order in the background.
+
+        Call flush() before posting to the thread by other means to keep ordering.
+
+        Args:
+            text: Message text to post
+            emoji: Emoji to prefix message with
+
+        Returns:
+            True (posting failures are logged by the background poster)
+        """
+        with self._poster_lock:
+            self._post_queue.put((text, emoji))
+            if self._poster is None:
+                self._poster = threading.Thread(target=self._run_poster, name="dog-slack-poster", daemon=True)
+                self._poster.start()
+        return True
+
+    def flush(self) -> None:
+        """Block until every queued message has been posted (or failed)."""
+        self._post_queue.join()
+
+    def _run_poster(self) -> None:
+        """Post queued messages in order; exit after POSTER_IDLE_SECONDS without any."""
+        while True:
+            try:
+                text, emoji = self._post_queue.get(timeout=POSTER_IDLE_SECONDS)
+            except queue.Empty:
+                with self._poster_lock:
+                    # post_message enqueues under the same lock, so nothing can be stranded
+                    if self._post_queue.empty():
+                        self._poster = None
+                        return
+                continue
+
+            try:
+                self._send_message(text, emoji)
+            finally:
+                self._post_queue.task_done()
+
+    def _send_message(self, text: str, emoji: str) -> bool:
+        """
+        Post a message to the Slack thread now.
 
         Args:
             text: Message text to post
@@ -75,13 +136,17 @@ class DogCommunication:
         """
         Post a question to the Slack thread and indicate waiting for response.
 
+        Posted synchronously (after any queued updates), since the caller is
+        about to wait for the answer.
+
         Args:
             question: Question to ask
 
         Returns:
             True if successful, False otherwise
         """
-        return self.post_message(
+        self.flush()
+        return self._send_message(
             f"❓ **Question:** {question}\n\n_Please reply in this thread. I'll check back shortly._",
             emoji="🐕"
         )
@@ -94,7 +159,7 @@ class DogCommunication:
             message: Status update message
 
         Returns:
-            True if successful, False otherwise
+            True once queued (see post_message; failures are only logged)
         """
         return self.post_message(message, emoji="🔄")
 
@@ -114,22 +179,21 @@ class DogCommunication:
         try:
             messages_key = f"dogwalker:thread_messages:{self.thread_ts}"
 
-            # Get all messages
-            all_messages = self.redis_client.lrange(messages_key, 0, -1)
+            # Fetch only the messages after our pointer (not the whole history)
+            new_raw = self.redis_client.lrange(messages_key, self.message_pointer, -1)
 
-            # Parse messages starting from our pointer
             new_messages = []
-            for i in range(self.message_pointer, len(all_messages)):
+            for i, raw in enumerate(new_raw, start=self.message_pointer):
                 try:
-                    message_data = json.loads(all_messages[i])
+                    message_data = _loads_message(raw)
                     new_messages.append(message_data)
-                except json.JSONDecodeError as e:
+                except ValueError as e:
                     logger.error(f"Failed to parse message at index {i}: {e}")
                     continue
 
-            # Update pointer
+            # Update pointer (past unparseable messages too, so they aren't re-read)
+            self.message_pointer += len(new_raw)
             if new_messages:
-                self.message_pointer = len(all_messages)
                 logger.info(f"Read {len(new_messages)} new message(s) from thread")
 
             return new_messages
@@ -147,11 +211,14 @@ class DogCommunication:
         """
         Wait for human responses in the Slack thread.
 
-        Polls Redis for new messages until timeout or messages received.
+        Subscribes to the thread's Redis notification channel (published by the
+        orchestrator after storing each message), so a reply wakes the dog
+        immediately. Redis is still re-read at least every poll_interval, in case a
+        notification is missed, and polling alone is used if the subscription fails.
 
         Args:
             timeout: Maximum time to wait in seconds (default: 10 minutes)
-            poll_interval: How often to check for messages in seconds (default: 10s)
+            poll_interval: How often to check for messages in seconds when polling (default: 10s)
             min_messages: Minimum number of messages to wait for (default: 1)
 
         Returns:
@@ -165,24 +232,48 @@ class DogCommunication:
         start_time = time.time()
         all_responses = []
 
-        while (time.time() - start_time) < timeout:
-            # Check for new messages
-            new_messages = self.get_new_messages()
-
-            if new_messages:
-                all_responses.extend(new_messages)
-                logger.info(f"Received {len(new_messages)} message(s)")
-
-                # If we have enough messages, return immediately
-                if len(all_responses) >= min_messages:
-                    logger.info(
-                        f"Received {len(all_responses)} message(s), "
-                        f"stopping wait"
-                    )
-                    return all_responses
+        # Subscribe before the first read so a reply in between isn't missed
+        pubsub = None
+        try:
+            pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(f"dogwalker:thread_notify:{self.thread_ts}")
+        except Exception as e:
+            logger.warning(f"Could not subscribe to thread notifications ({e}), polling instead")
+            pubsub = None
 
-            # Sleep before next poll
-            time.sleep(poll_interval)
+        try:
+            while (time.time() - start_time) < timeout:
+                # Check for new messages
+                new_messages = self.get_new_messages()
+
+                if new_messages:
+                    all_responses.extend(new_messages)
+                    logger.info(f"Received {len(new_messages)} message(s)")
+
+                    # If we have enough messages, return immediately
+                    if len(all_responses) >= min_messages:
+                        logger.info(
+                            f"Received {len(all_responses)} message(s), "
+                            f"stopping wait"
+                        )
+                        return all_responses
+
+                if pubsub:
+                    # Block until a new message is announced, but no longer than a poll
+                    # interval so a missed or unpublished notification only delays us
+                    remaining = timeout - (time.time() - start_time)
+                    try:
+                        pubsub.get_message(timeout=max(min(remaining, poll_interval), 0))
+                    except Exception as e:
+                        logger.warning(f"Thread notification subscription failed ({e}), polling instead")
+                        pubsub.close()
+                        pubsub = None
+                else:
+                    # Sleep before next poll
+                    time.sleep(poll_interval)
+        finally:
+            if pubsub:
+                pubsub.close()
 
         if all_responses:
             logger.info(
@@ -258,9 +349,9 @@ to match the human's request while maintaining code quality and best practices.
             parsed_messages = []
             for msg_json in all_messages:
                 try:
-                    message_data = json.loads(msg_json)
+                    message_data = _loads_message(msg_json)
                     parsed_messages.append(message_data)
-                except json.JSONDecodeError as e:
+                except ValueError as e:
                     logger.error(f"Failed to parse message: {e}")
                     continue
 
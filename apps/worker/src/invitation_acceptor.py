@@ -1,8 +1,10 @@
 """Automatic GitHub invitation acceptor for dog accounts."""
 
 from celery_app import app
+import functools
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add shared module to path
@@ -13,6 +15,83 @@ from github_client import GitHubClient
 
 logger = logging.getLogger(__name__)
 
+# Maximum dogs whose invitations are checked at once
+MAX_CONCURRENT_DOG_CHECKS = 16
+
+
+@functools.lru_cache(maxsize=64)
+def _github_client(token: str) -> GitHubClient:
+    """
+    Get the GitHubClient for a dog's token, reused across Celery Beat ticks.
+
+    Keeping the client keeps its HTTPS connections and invitations ETag, so
+    later checks skip the TLS handshake and usually get a free 304.
+
+    Args:
+        token: Dog's GitHub token
+
+    Returns:
+        GitHubClient for the token
+    """
+    # Invitations are user-level, not repo-level, so the repo name is never used
+    return GitHubClient(token=token, repo_name="dummy/dummy")
+
+
+def _check_dog_invitations(dog: dict) -> tuple[int, int, int]:
+    """
+    Check one dog's pending GitHub invitations and accept them.
+
+    Errors are caught and counted here so one bad token doesn't affect the other dogs.
+
+    Args:
+        dog: Dog config entry (name, github_token, ...)
+
+    Returns:
+        Tuple of (dogs_checked, invitations_accepted, failures) for this dog
+    """
+    dog_name = dog.get("name", "Unknown")
+    dog_token = dog.get("github_token")
+
+    if not dog_token:
+        logger.warning(f"Dog {dog_name} has no GitHub token - skipping")
+        return 0, 0, 0
+
+    accepted = 0
+    failed = 0
+
+    try:
+        github_client = _github_client(dog_token)
+
+        # Get pending invitations
+        invitations = github_client.get_pending_invitations()
+
+        if not invitations:
+            logger.debug(f"✅ No pending invitations for {dog_name}")
+            return 1, 0, 0
+
+        logger.info(f"📬 Found {len(invitations)} pending invitation(s) for {dog_name}")
+
+        # Accept each invitation
+        for invitation in invitations:
+            invitation_id = invitation.get("id")
+            repo_name = invitation.get("repository", {}).get("full_name", "unknown")
+            inviter = invitation.get("inviter", {}).get("login", "unknown")
+
+            logger.info(f"🤝 Accepting invitation for {dog_name} to {repo_name} from {inviter}")
+
+            if github_client.accept_invitation(invitation_id):
+                accepted += 1
+                logger.info(f"✅ {dog_name} accepted invitation to {repo_name}")
+            else:
+                failed += 1
+                logger.error(f"❌ Failed to accept invitation for {dog_name} to {repo_name}")
+
+    except Exception as e:
+        logger.exception(f"Error checking invitations for {dog_name}: {e}")
+        failed += 1
+
+    return 1, accepted, failed
+
 
 @app.task(name="invitation_acceptor.accept_pending_invitations")
 def accept_pending_invitations():
@@ -20,7 +99,7 @@ def accept_pending_invitations():
     Periodic task to check and accept GitHub repository invitations for all dogs.
 
     This task runs every 5 minutes via Celery Beat and:
-    1. Iterates through all configured dogs
+    1. Checks all configured dogs concurrently
     2. Checks each dog's pending GitHub repository invitations
     3. Automatically accepts any pending invitations
     4. Logs all acceptances for audit trail
@@ -47,55 +126,15 @@ def accept_pending_invitations():
 
         logger.info(f"Checking invitations for {len(dogs)} dog(s)")
 
-        # Check each dog for pending invitations
-        for dog in dogs:
-            dog_name = dog.get("name", "Unknown")
-            dog_token = dog.get("github_token")
-
-            if not dog_token:
-                logger.warning(f"Dog {dog_name} has no GitHub token - skipping")
-                continue
-
-            total_checked += 1
-
-            try:
-                # Create GitHub client for this dog
-                # Note: We need a repo_name for GitHubClient, but we only use methods
-                # that don't need it (invitations are user-level, not repo-level)
-                # So we pass a dummy repo name
-                github_client = GitHubClient(
-                    token=dog_token,
-                    repo_name="dummy/dummy"  # Not used for invitation methods
-                )
-
-                # Get pending invitations
-                invitations = github_client.get_pending_invitations()
-
-                if not invitations:
-                    logger.debug(f"✅ No pending invitations for {dog_name}")
-                    continue
-
-                logger.info(f"📬 Found {len(invitations)} pending invitation(s) for {dog_name}")
-
-                # Accept each invitation
-                for invitation in invitations:
-                    invitation_id = invitation.get("id")
-                    repo_name = invitation.get("repository", {}).get("full_name", "unknown")
-                    inviter = invitation.get("inviter", {}).get("login", "unknown")
-
-                    logger.info(f"🤝 Accepting invitation for {dog_name} to {repo_name} from {inviter}")
-
-                    if github_client.accept_invitation(invitation_id):
-                        total_accepted += 1
-                        logger.info(f"✅ {dog_name} accepted invitation to {repo_name}")
-                    else:
-                        total_failed += 1
-                        logger.error(f"❌ Failed to accept invitation for {dog_name} to {repo_name}")
-
-            except Exception as e:
-                logger.exception(f"Error checking invitations for {dog_name}: {e}")
-                total_failed += 1
-                continue
+        # Dogs have independent tokens (and rate limits), so check them concurrently
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CONCURRENT_DOG_CHECKS, len(dogs)),
+            thread_name_prefix="invitations"
+        ) as executor:
+            for checked, accepted, failed in executor.map(_check_dog_invitations, dogs):
+                total_checked += checked
+                total_accepted += accepted
+                total_failed += failed
 
         # Log summary
         logger.info(f"📊 Invitation check complete: {total_checked} dog(s) checked, "
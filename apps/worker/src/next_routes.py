@@ -0,0 +1,145 @@
+"""Next.js route scoping: which page URLs a changed file can affect."""
+
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+# Next.js app-router files that only affect their own route segment (and its children);
+# route.* handlers are excluded since pages may fetch from them
+_APP_ROUTE_FILE_RE = re.compile(r"^(page|layout|template|loading|error|not-found|default)\.(js|jsx|ts|tsx|mdx)$")
+_PAGE_FILE_RE = re.compile(r"\.(js|jsx|ts|tsx|mdx)$")
+
+# Directories never searched for a Next.js project
+_SKIP_DIRS = frozenset({"node_modules", ".git", ".next", "dist", "build"})
+
+# Changed files that can't affect rendered pages: tests, and the worker's own untracked
+# artifacts in the work tree (screenshots, reference images, fetched-site captures)
+_NON_RENDERING_FILE_RE = re.compile(r"(\.(test|spec)\.[jt]sx?$|(^|/)__tests__/|^\.dogwalker_\w+/)")
+
+
+def next_routing_roots(repo_path: Path) -> list[str]:
+    """
+    Find the Next.js routing directories (app/ and pages/) in a repo.
+
+    Looks for next.config.* at the repo root and up to two directories deep
+    (monorepo apps). Next.js uses the project's own app/ and pages/ dirs, or
+    src/app and src/pages when neither exists at the project root.
+
+    Args:
+        repo_path: Repository root
+
+    Returns:
+        Routing directories relative to the repo root (e.g. ["src/app"]); empty if
+        the repo is not a Next.js project
+    """
+    projects = []
+    for pattern in ("next.config.*", "*/next.config.*", "*/*/next.config.*"):
+        for config_file in repo_path.glob(pattern):
+            project = config_file.parent
+            if not _SKIP_DIRS.intersection(project.relative_to(repo_path).parts):
+                projects.append(project)
+
+    roots = []
+    for project in dict.fromkeys(projects):
+        candidates = [project / "app", project / "pages"]
+        if not any(candidate.is_dir() for candidate in candidates):
+            candidates = [project / "src" / "app", project / "src" / "pages"]
+        roots.extend(candidate.relative_to(repo_path).as_posix() for candidate in candidates if candidate.is_dir())
+    return roots
+
+
+def route_scope(changed_file: str, routing_roots: Iterable[str]) -> Optional[list[str]]:
+    """
+    Get the route segments a changed Next.js routing file can affect.
+
+    Args:
+        changed_file: Path relative to the repo root
+        routing_roots: Routing directories from next_routing_roots
+
+    Returns:
+        Route segments (e.g. ["blog", "[slug]"]) the file affects, along with their
+        child routes; None if it may affect any page (components, styles, config,
+        API routes, anything outside a routing root, ...)
+    """
+    for root in routing_roots:
+        if not changed_file.startswith(f"{root}/"):
+            continue
+
+        parts = changed_file[len(root) + 1:].split("/")
+        filename = parts[-1]
+        if root.rsplit("/", 1)[-1] == "app":
+            if not _APP_ROUTE_FILE_RE.match(filename):
+                return None  # route.* handlers and colocated modules
+            segments = parts[:-1]
+        else:
+            if parts[0] == "api" or not _PAGE_FILE_RE.search(filename):
+                return None  # API routes feed pages' data
+            name = _PAGE_FILE_RE.sub("", filename)
+            if name.startswith("_"):
+                return None  # _app/_document wrap every page
+            segments = parts[:-1] + ([] if name == "index" else [name])
+        break
+    else:
+        return None
+
+    url_segments = []
+    for segment in segments:
+        if segment.startswith("@") or (segment.startswith("(") and segment.endswith(")")):
+            continue  # Parallel-route slots and route groups don't appear in URLs
+        if segment.startswith(("(", "_")):
+            return None  # Intercepting routes and private folders - be conservative
+        url_segments.append(segment)
+    return url_segments
+
+
+def url_in_route_scope(url: str, scope: list[str]) -> bool:
+    """
+    Check whether a page URL falls under a route scope from route_scope.
+
+    Args:
+        url: Page URL (relative like "/blog/post" or absolute)
+        scope: Route segments, where "[param]" matches any one segment
+
+    Returns:
+        True if the URL is the scoped route or one of its children
+    """
+    url_segments = [segment for segment in urlparse(url).path.split("/") if segment]
+    for i, segment in enumerate(scope):
+        if segment.startswith(("[...", "[[...")):
+            return True  # Catch-all matches the rest
+        if i >= len(url_segments):
+            return False
+        if not segment.startswith("[") and segment != url_segments[i]:
+            return False
+    return True
+
+
+def affected_urls(urls: Iterable[str], changed_files: Iterable[str], routing_roots: Iterable[str]) -> list[str]:
+    """
+    Filter page URLs down to those the changed files can affect.
+
+    Args:
+        urls: Page URLs that were screenshotted
+        changed_files: Paths relative to the repo root
+        routing_roots: Routing directories from next_routing_roots
+
+    Returns:
+        URLs (in input order) whose rendering may have changed; all of them unless
+        every rendering change is a routing file with a bounded scope
+    """
+    urls = list(urls)
+    routing_roots = list(routing_roots)
+    if not routing_roots:
+        return urls
+
+    scopes = []
+    for changed_file in changed_files:
+        if _NON_RENDERING_FILE_RE.search(changed_file):
+            continue
+        scope = route_scope(changed_file, routing_roots)
+        if scope is None:
+            return urls
+        scopes.append(scope)
+
+    return [url for url in urls if any(url_in_route_scope(url, scope) for scope in scopes)]
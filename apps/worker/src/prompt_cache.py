@@ -0,0 +1,202 @@
+"""On-disk exact-match and near-duplicate caches for Claude API responses."""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "dogwalker" / "llm.db"
+
+# Most recent entries per template scanned for a near-duplicate match
+MAX_SIMILAR_CANDIDATES = 500
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class CachedResponse(NamedTuple):
+    """A stored Claude response and the token usage of the original call."""
+
+    response: str
+    input_tokens: int
+    output_tokens: int
+
+
+class PromptCache:
+    """
+    SQLite-backed cache keyed by a SHA-256 of the output-affecting request params.
+
+    Only parameters that change the response (model, prompt, max_tokens, ...) go
+    into the key - never the API key - so identical prompts hit across runs.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        """
+        Initialize the cache, creating the database file if needed.
+
+        Args:
+            path: SQLite database file (default: ~/.cache/dogwalker/llm.db)
+        """
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One connection shared across threads; the lock serializes access
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT,
+                    input_tokens INT,
+                    output_tokens INT,
+                    created REAL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS similar (
+                    template TEXT,
+                    text TEXT,
+                    response TEXT,
+                    created REAL,
+                    PRIMARY KEY (template, text)
+                )
+                """
+            )
+
+    @staticmethod
+    def make_key(model_name: str, prompt: Any, max_tokens: int, **params: Any) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model_name: Model name (without provider prefix)
+            prompt: Prompt text (or structured message content)
+            max_tokens: Maximum tokens in response
+            **params: Any other output-affecting params (e.g., stop_sequences)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        payload = {"model": model_name, "prompt": prompt, "max_tokens": max_tokens, **params}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            CachedResponse if present, None otherwise (including when the database
+            can't be read)
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, input_tokens, output_tokens FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            # A failed cache read must never fail the API call itself
+            logger.warning(f"Failed to read LLM cache entry: {e}")
+            return None
+        return CachedResponse(*row) if row else None
+
+    def put(self, key: str, model_name: str, response: str, input_tokens: int, output_tokens: int) -> None:
+        """
+        Store (or replace) a response.
+
+        Args:
+            key: Key from make_key
+            model_name: Model name (without provider prefix)
+            response: Response text
+            input_tokens: Input tokens billed for the original call
+            output_tokens: Output tokens billed for the original call
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model_name, response, input_tokens, output_tokens, time.time()),
+                )
+        except sqlite3.Error as e:
+            # A failed cache write must never fail the API call itself
+            logger.warning(f"Failed to write LLM cache entry: {e}")
+
+    @staticmethod
+    def similarity(a: str, b: str) -> float:
+        """
+        Jaccard similarity of the lowercase word sets of two texts.
+
+        Args:
+            a: First text
+            b: Second text
+
+        Returns:
+            Similarity between 0.0 (no shared words) and 1.0 (same words)
+        """
+        words_a = set(_WORD_RE.findall(a.lower()))
+        words_b = set(_WORD_RE.findall(b.lower()))
+        if not words_a or not words_b:
+            return 0.0
+        return len(words_a & words_b) / len(words_a | words_b)
+
+    def find_similar(self, template_id: str, text: str) -> Optional[tuple[float, str, str]]:
+        """
+        Find the stored input most similar to text for the same prompt template.
+
+        Args:
+            template_id: Identifies the prompt scaffold (e.g., "pr_title:57")
+            text: The variable part of the prompt (e.g., the task description)
+
+        Returns:
+            Tuple of (similarity, stored text, stored response), or None if nothing is
+            stored or the database can't be read
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT text, response FROM similar WHERE template = ? ORDER BY created DESC LIMIT ?",
+                    (template_id, MAX_SIMILAR_CANDIDATES),
+                ).fetchall()
+        except sqlite3.Error as e:
+            # A failed cache read must never fail the API call itself
+            logger.warning(f"Failed to read LLM similarity cache: {e}")
+            return None
+
+        best = None
+        for stored_text, response in rows:
+            score = self.similarity(text, stored_text)
+            if best is None or score > best[0]:
+                best = (score, stored_text, response)
+        return best
+
+    def put_similar(self, template_id: str, text: str, response: str) -> None:
+        """
+        Store a response for near-duplicate lookups.
+
+        Args:
+            template_id: Identifies the prompt scaffold (e.g., "pr_title:57")
+            text: The variable part of the prompt (e.g., the task description)
+            response: Response text
+        """
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO similar VALUES (?, ?, ?, ?)",
+                    (template_id, text, response, time.time()),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write LLM similarity cache entry: {e}")
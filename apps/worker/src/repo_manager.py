@@ -2,6 +2,7 @@
 
 import subprocess
 import logging
+import shutil
 from pathlib import Path
 from typing import Optional
 
@@ -59,7 +60,6 @@ class RepoManager:
 
         # Remove existing directory if present
         if self.work_dir.exists():
-            import shutil
             shutil.rmtree(self.work_dir)
 
         self.work_dir.parent.mkdir(parents=True, exist_ok=True)
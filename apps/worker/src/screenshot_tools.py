@@ -1,16 +1,64 @@
 """Frontend screenshot tools for visual before/after comparison."""
 
+import asyncio
+import codecs
+import hashlib
+import json
 import logging
 import os
+import re
+import select
+import shutil
+import socket
 import subprocess
+import threading
 import time
 import signal
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Any
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+import requests
+from requests.adapters import HTTPAdapter
+from playwright.async_api import async_playwright
+
+from next_routes import affected_urls, next_routing_roots
+
+try:
+    from PIL import Image
+except ImportError:
+    # Optional: without Pillow, screenshots are uploaded as PNG
+    Image = None
+
+try:
+    import uvloop
+except ImportError:
+    # Optional (not available on Windows): the screenshot loop falls back to asyncio's default
+    uvloop = None
 
 logger = logging.getLogger(__name__)
 
+# Maximum pages rendered at once by capture_multiple_screenshots
+MAX_CONCURRENT_SCREENSHOTS = 8
+
+# Lossy WebP quality for uploaded screenshots (UI text stays crisp at 85)
+WEBP_QUALITY = 85
+
+# Seconds to let a warmed-up page finish async compilation before validating it
+PAGE_SETTLE_SECONDS = 5
+
+
+@dataclass(slots=True)
+class ShotInfo:
+    """A captured screenshot and where it was uploaded."""
+
+    url: str
+    filename: str
+    path: str
+    github_url: Optional[str] = None  # Set if the GitHub upload succeeds
+    digest: Optional[str] = None  # BLAKE2b of the captured PNG, to spot unchanged pages
+
 
 class ScreenshotTools:
     """Tools for capturing before/after screenshots of frontend changes."""
@@ -33,6 +81,19 @@ class ScreenshotTools:
         self.dev_server_process: Optional[subprocess.Popen] = None
         self.dev_server_port: Optional[int] = None
         self.last_error_type: Optional[str] = None  # Track why dev server failed (for Aider fixes)
+        self.dev_server_output: deque[str] = deque(maxlen=200)  # Recent output once the server is up
+
+        # One browser shared by the before and after phases; it's bound to the
+        # event loop that launched it, so that loop is kept too (see _run_async)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._playwright: Optional[Any] = None
+        self._browser: Optional[Any] = None
+        # A loop runs one coroutine at a time; prewarm_browser may come from another thread
+        self._loop_lock = threading.Lock()
+
+        # Keep-alive connection pool for warm-up, validation, and reload polling
+        self._http_session: Optional[Any] = None
+        self._http_lock = threading.Lock()  # Probes run from pool threads
 
     def detect_dev_server_command(self) -> Optional[str]:
         """
@@ -45,7 +106,6 @@ class ScreenshotTools:
         package_json = self.repo_path / "package.json"
         if package_json.exists():
             try:
-                import json
                 with open(package_json) as f:
                     data = json.load(f)
                     scripts = data.get("scripts", {})
@@ -81,7 +141,6 @@ class ScreenshotTools:
         Returns:
             True if port is available, False otherwise
         """
-        import socket
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
                 sock.settimeout(1)
@@ -101,8 +160,6 @@ class ScreenshotTools:
         Returns:
             Detected port number or None
         """
-        import re
-
         # Common patterns in dev server output
         patterns = [
             r'localhost:(\d+)',
@@ -195,7 +252,6 @@ class ScreenshotTools:
             cache_path = self.repo_path / cache_dir
             if cache_path.exists():
                 try:
-                    import shutil
                     shutil.rmtree(cache_path)
                     logger.info(f"Cleared build cache: {cache_dir}/")
                 except Exception as e:
@@ -213,6 +269,9 @@ class ScreenshotTools:
         Returns:
             True if server started successfully, False otherwise
         """
+        # Only describes this attempt's failure, not an earlier one
+        self.last_error_type = None
+
         command = self.detect_dev_server_command()
         if not command:
             logger.warning("No dev server command detected, skipping server start")
@@ -280,24 +339,50 @@ class ScreenshotTools:
             # Capture server output in background
             server_output_lines = []
 
+            # On Unix the pipe is read in raw chunks (bypassing the text wrapper, whose
+            # buffer select can't see) and split into lines here
+            stdout_fd = self.dev_server_process.stdout.fileno()
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            pending_lines: deque[str] = deque()  # Complete lines not yet processed
+            partial_line = ""  # Text after the last newline, completed by the next chunk
+
+            def wait_for_output(timeout: float) -> bool:
+                """Wait until server output is available, waking as soon as it arrives."""
+                nonlocal partial_line
+                if pending_lines:
+                    return True
+                if os.name == 'nt':
+                    time.sleep(timeout)
+                    return False
+
+                ready, _, _ = select.select([stdout_fd], [], [], timeout)
+                if not ready:
+                    return False
+                chunk = os.read(stdout_fd, 65536)
+                if not chunk:
+                    # EOF - process exited; don't spin until poll() notices
+                    time.sleep(timeout)
+                    return False
+
+                lines = (partial_line + decoder.decode(chunk)).split("\n")
+                partial_line = lines.pop()
+                pending_lines.extend(lines)
+                return bool(pending_lines)
+
             def read_output():
                 """Read server output in a non-blocking way."""
                 if self.dev_server_process and self.dev_server_process.stdout:
                     try:
                         # On Unix/macOS, use select for non-blocking read
                         if os.name != 'nt':
-                            import select
-                            ready, _, _ = select.select([self.dev_server_process.stdout], [], [], 0.1)
-                            if ready:
-                                line = self.dev_server_process.stdout.readline()
-                                if line:
-                                    server_output_lines.append(line.strip())
-                                    logger.debug(f"Dev server: {line.strip()}")
-                                    return line
+                            if wait_for_output(0.1):
+                                line = pending_lines.popleft() + "\n"
+                                server_output_lines.append(line.strip())
+                                logger.debug(f"Dev server: {line.strip()}")
+                                return line
                         else:
                             # On Windows, just try to read (process is in text mode with buffering)
                             # This is less ideal but works
-                            import threading
                             line_holder = [None]
 
                             def read_line():
@@ -384,8 +469,8 @@ class ScreenshotTools:
                 if compilation_in_progress:
                     time_since_compilation = time.time() - last_compilation_check
                     if time_since_compilation < 30:
-                        # Still compiling, wait a bit longer before checking HTTP
-                        time.sleep(2)
+                        # Still compiling, wait a bit longer (or for more output) before checking HTTP
+                        wait_for_output(2)
                         continue
                     else:
                         # Compilation stuck - likely has errors that aren't being logged clearly
@@ -408,14 +493,18 @@ class ScreenshotTools:
                         self.last_error_type = "compilation_hang"
                         return False
 
+                # Handle output that's already buffered before probing HTTP
+                if pending_lines:
+                    continue
+
                 # Try HTTP request with adaptive timeout
                 # Use longer timeout if we saw "Ready" message (server might be compiling pages on-demand)
                 http_timeout = 30 if server_ready_seen else 10
                 try:
-                    import requests
                     response = requests.get(f"http://localhost:{self.dev_server_port}", timeout=http_timeout)
                     if response.status_code < 500:  # Server is responding
                         logger.info(f"✅ Dev server ready on port {self.dev_server_port}")
+                        self._start_output_drain()
                         return True
                     consecutive_timeouts = 0  # Reset on successful connection
                 except requests.exceptions.Timeout:
@@ -489,7 +578,8 @@ class ScreenshotTools:
                     logger.info(f"Dev server status: {status} ({elapsed}s elapsed)")
                     last_check = current_time
 
-                time.sleep(2)
+                # Poll again in 2s, or as soon as the server prints something (e.g. "ready in")
+                wait_for_output(2)
 
             # Timeout reached - dev server process is running but not responding
             # Read any remaining output
@@ -507,11 +597,11 @@ class ScreenshotTools:
                 # Try the detected port (give it a few attempts in case it's still compiling)
                 for attempt in range(3):
                     try:
-                        import requests
                         response = requests.get(f"http://localhost:{detected_port}", timeout=15)
                         if response.status_code < 500:
                             logger.info(f"✅ Server IS running on port {detected_port}! Using this port instead.")
                             self.dev_server_port = detected_port
+                            self._start_output_drain()
                             return True
                     except requests.exceptions.Timeout:
                         if attempt < 2:
@@ -545,6 +635,92 @@ class ScreenshotTools:
             logger.error(f"Failed to start dev server: {e}")
             return False
 
+    def _start_output_drain(self) -> None:
+        """
+        Keep reading dev server output in a background thread once it is ready.
+
+        The server may stay up while code changes land (hot reload), and an unread
+        stdout pipe would eventually fill up and block it.
+        """
+        process = self.dev_server_process
+        if not process or not process.stdout:
+            return
+
+        def drain() -> None:
+            try:
+                for line in process.stdout:
+                    self.dev_server_output.append(line.rstrip())
+            except (OSError, ValueError):
+                pass  # Pipe closed when the server stopped
+
+        threading.Thread(target=drain, name="dev-server-output", daemon=True).start()
+
+    def is_dev_server_running(self) -> bool:
+        """Check whether the dev server process started by start_dev_server is still alive."""
+        return self.dev_server_process is not None and self.dev_server_process.poll() is None
+
+    def _http(self) -> Any:
+        """
+        Return the shared requests.Session for dev server probes.
+
+        Warm-up, URL validation, and reload polling all hit the same localhost
+        server, so reusing pooled keep-alive connections skips a TCP handshake per
+        request. The pool is sized for MAX_CONCURRENT_SCREENSHOTS parallel probes.
+
+        Returns:
+            requests.Session
+        """
+        with self._http_lock:
+            if self._http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=MAX_CONCURRENT_SCREENSHOTS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._http_session = session
+            return self._http_session
+
+    def wait_for_hmr_ready(self, urls: list[str], timeout: int = 30) -> bool:
+        """
+        Wait for a running dev server to serve the given pages again after code changes.
+
+        The file watcher (Next.js/Vite/webpack HMR) recompiles changed modules on its
+        own; this polls each page until it responds without a server error, which
+        also makes the server compile each page before it is screenshotted.
+
+        Args:
+            urls: Pages about to be captured (relative like "/about" or absolute)
+            timeout: Maximum seconds to wait for all of them
+
+        Returns:
+            True if every page is responding, False if the server died, errors, or timed out
+        """
+        deadline = time.time() + timeout
+        pending = list(dict.fromkeys(urls)) or ["/"]
+        while pending and time.time() < deadline:
+            if not self.is_dev_server_running():
+                logger.warning("Dev server exited while waiting for hot reload")
+                return False
+            url = pending[0]
+            full_url = f"http://localhost:{self.dev_server_port}{url}" if url.startswith("/") else url
+            try:
+                response = self._http().get(full_url, timeout=max(1, deadline - time.time()))
+                if response.status_code < 500:
+                    pending.pop(0)
+                    continue
+                logger.debug(f"Dev server returned HTTP {response.status_code} for {url} while reloading")
+            except requests.exceptions.RequestException as e:
+                logger.debug(f"Dev server not responding yet for {url}: {e}")
+            time.sleep(1)
+
+        if not pending:
+            logger.info(f"✅ Dev server hot-reloaded and serving {len(urls)} page(s) on port {self.dev_server_port}")
+            return True
+
+        logger.warning(f"Dev server did not recover within {timeout}s after code changes (waiting on {pending[0]})")
+        for line in list(self.dev_server_output)[-30:]:
+            logger.warning(f"  {line}")
+        return False
+
     def stop_dev_server(self) -> None:
         """Stop the development server."""
         if self.dev_server_process:
@@ -562,67 +738,6 @@ class ScreenshotTools:
             self.dev_server_process = None
             self.dev_server_port = None
 
-    def capture_screenshot(
-        self,
-        url: str,
-        filename: str,
-        viewport_width: int = 1920,
-        viewport_height: int = 1080,
-        full_page: bool = True
-    ) -> Optional[str]:
-        """
-        Capture a screenshot of a URL.
-
-        Args:
-            url: URL to screenshot (can be relative like "/about")
-            filename: Filename for screenshot
-            viewport_width: Browser viewport width
-            viewport_height: Browser viewport height
-            full_page: Capture full page or just viewport
-
-        Returns:
-            Path to screenshot file or None on failure
-        """
-        # Convert relative URLs to absolute
-        if url.startswith("/"):
-            if not self.dev_server_port:
-                logger.error("Cannot screenshot relative URL - dev server not running")
-                return None
-            url = f"http://localhost:{self.dev_server_port}{url}"
-
-        logger.info(f"Capturing screenshot: {url} -> {filename}")
-
-        screenshot_path = self.screenshots_dir / filename
-
-        try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                context = browser.new_context(
-                    viewport={'width': viewport_width, 'height': viewport_height}
-                )
-                page = context.new_page()
-
-                # Navigate with timeout
-                page.goto(url, wait_until='networkidle', timeout=30000)
-
-                # Wait a bit for any animations/hydration
-                page.wait_for_timeout(2000)
-
-                # Capture screenshot
-                page.screenshot(path=str(screenshot_path), full_page=full_page)
-
-                browser.close()
-
-                logger.info(f"Screenshot saved: {screenshot_path}")
-                return str(screenshot_path)
-
-        except PlaywrightTimeout as e:
-            logger.error(f"Timeout capturing screenshot of {url}: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to capture screenshot of {url}: {e}")
-            return None
-
     def validate_url(self, url: str) -> bool:
         """
         Check if a URL exists and returns a valid response (not 404/500).
@@ -636,11 +751,9 @@ class ScreenshotTools:
             True if URL is valid and accessible, False otherwise
         """
         try:
-            import requests
-
             # Try HEAD first (faster)
             try:
-                response = requests.head(url, timeout=5, allow_redirects=True)
+                response = self._http().head(url, timeout=5, allow_redirects=True)
                 # Accept 200-399 status codes (success and redirects)
                 if 200 <= response.status_code < 400:
                     logger.info(f"✅ URL validated: {url} (HTTP {response.status_code})")
@@ -656,7 +769,7 @@ class ScreenshotTools:
                 logger.info(f"HEAD request failed for {url}, trying GET...")
 
             # Try GET if HEAD failed or returned 405
-            response = requests.get(url, timeout=5, allow_redirects=True)
+            response = self._http().get(url, timeout=5, allow_redirects=True)
             is_valid = 200 <= response.status_code < 400
             if is_valid:
                 logger.info(f"✅ URL validated: {url} (HTTP {response.status_code})")
@@ -668,41 +781,33 @@ class ScreenshotTools:
             logger.warning(f"❌ URL validation failed for {url}: {e}")
             return False
 
-    def _warm_up_pages(self, urls: list[str]) -> None:
+    def _warm_up_page(self, url: str) -> None:
         """
-        Pre-fetch URLs to trigger Next.js compilation before screenshotting.
+        Pre-fetch a URL to trigger Next.js compilation before screenshotting.
 
         Next.js compiles pages on-demand, so we need to request them first
         to ensure changes are visible in screenshots.
 
         Args:
-            urls: List of URLs to warm up
+            url: URL to warm up (relative like "/about" or absolute)
         """
-        import requests
-
-        logger.info(f"Warming up {len(urls)} pages to trigger compilation...")
-
-        for url in urls:
-            full_url = url
-            if url.startswith("/"):
-                full_url = f"http://localhost:{self.dev_server_port}{url}"
-
-            try:
-                # Make request to trigger compilation (don't care about response)
-                requests.get(full_url, timeout=15)
-                logger.info(f"  ✅ Warmed up: {url}")
-            except Exception as e:
-                logger.warning(f"  ⚠️  Failed to warm up {url}: {e}")
+        full_url = url
+        if url.startswith("/"):
+            full_url = f"http://localhost:{self.dev_server_port}{url}"
 
-        # Give server a moment to finish any async compilation
-        logger.info("Waiting 5s for compilation to complete...")
-        time.sleep(5)
+        try:
+            # Make request to trigger compilation (don't care about response)
+            self._http().get(full_url, timeout=15)
+            logger.info(f"  ✅ Warmed up: {url}")
+        except Exception as e:
+            logger.warning(f"  ⚠️  Failed to warm up {url}: {e}")
 
     def capture_multiple_screenshots(
         self,
         urls: list[str],
-        prefix: str = ""
-    ) -> list[dict[str, str]]:
+        prefix: str = "",
+        previous: Optional[list[ShotInfo]] = None
+    ) -> list[ShotInfo]:
         """
         Capture screenshots of multiple URLs and upload to GitHub.
         Only screenshots URLs that return valid HTTP responses (not 404s).
@@ -710,67 +815,317 @@ class ScreenshotTools:
         Args:
             urls: List of URLs to screenshot
             prefix: Filename prefix (e.g., "before_" or "after_")
+            previous: Earlier screenshots of the same URLs (e.g., the before shots);
+                      a page that renders byte-identically reuses its earlier shot
+                      instead of being encoded and uploaded again
 
         Returns:
-            List of dicts with url, filename, path (local), and github_url (if uploaded)
+            ShotInfo per captured page (github_url is None if the upload failed)
         """
-        # Warm up pages first to trigger Next.js compilation
-        self._warm_up_pages(urls)
+        try:
+            # The browser launches while pages warm up; each page is captured once it's ready
+            targets, screenshot_paths = self._run_async(self._capture_screenshots_concurrently(urls, prefix))
+        except Exception as e:
+            # e.g. the browser failed to launch - no page could be captured
+            logger.error(f"Failed to capture screenshots: {e}")
+            targets, screenshot_paths = [], []
+
+        captured = [
+            ShotInfo(url=url, filename=filename, path=screenshot_path, digest=self._png_digest(screenshot_path))
+            for (url, _, filename), screenshot_path in zip(targets, screenshot_paths)
+            if screenshot_path
+        ]
 
-        results = []
+        # Pages that render exactly as before keep their earlier (already uploaded) shot
+        previous_by_url = {shot.url: shot for shot in previous or () if shot.digest}
+        unchanged = {}
+        for shot in captured:
+            earlier = previous_by_url.get(shot.url)
+            if earlier and earlier.digest == shot.digest:
+                logger.info(f"♻️ {shot.url} is pixel-identical to its earlier screenshot - reusing it")
+                Path(shot.path).unlink(missing_ok=True)
+                unchanged[shot.url] = earlier
+        results = [shot for shot in captured if shot.url not in unchanged]
+
+        # Re-encode as WebP before uploading (several times smaller than PNG)
+        if results and Image is not None:
+            with ThreadPoolExecutor(max_workers=min(len(results), os.cpu_count() or 1)) as executor:
+                webp_paths = list(executor.map(self._encode_webp, [result.path for result in results]))
+            for result, webp_path in zip(results, webp_paths):
+                if webp_path:
+                    result.path = webp_path
+                    result.filename = Path(webp_path).name
+
+        # Upload to GitHub if client is available - all screenshots in one commit
+        if results and self.github_client:
+            logger.info(f"Uploading {len(results)} screenshots to GitHub")
+            github_urls = self.github_client.upload_images_to_github(
+                [(result.path, result.filename) for result in results]
+            )
 
-        for i, url in enumerate(urls, 1):
-            # Convert relative URLs to absolute for validation
-            full_url = url
-            if url.startswith("/"):
-                if not self.dev_server_port:
-                    logger.warning(f"Cannot validate relative URL {url} - dev server not running")
-                    continue
-                full_url = f"http://localhost:{self.dev_server_port}{url}"
-
-            # Validate URL before screenshotting
-            if not self.validate_url(full_url):
-                logger.info(f"Skipping screenshot of {url} - URL not accessible")
-                continue
-
-            # Generate filename from URL
-            url_slug = url.strip("/").replace("/", "_").replace(":", "").replace("?", "_")[:50]
-            if not url_slug:
-                url_slug = "home"
-
-            filename = f"{prefix}{url_slug}.png"
-
-            screenshot_path = self.capture_screenshot(url, filename)
-
-            if screenshot_path:
-                result = {
-                    'url': url,
-                    'filename': filename,
-                    'path': screenshot_path,
-                    'github_url': None  # Will be set if upload succeeds
-                }
-
-                # Upload to GitHub if client is available
-                if self.github_client:
-                    logger.info(f"Uploading screenshot to GitHub: {filename}")
-                    github_url = self.github_client.upload_image_to_github(
-                        image_path=screenshot_path,
-                        screenshot_filename=filename
-                    )
-
-                    if github_url:
-                        result['github_url'] = github_url
-                        logger.info(f"Screenshot uploaded successfully: {github_url}")
-                    else:
-                        logger.warning(f"Failed to upload screenshot to GitHub: {filename}")
+            for result in results:
+                result.github_url = github_urls.get(result.filename)
+                if result.github_url:
+                    logger.info(f"Screenshot uploaded successfully: {result.github_url}")
                 else:
-                    logger.warning("No GitHub client available, screenshot will not be uploaded")
+                    logger.warning(f"Failed to upload screenshot to GitHub: {result.filename}")
+        elif results:
+            logger.warning("No GitHub client available, screenshots will not be uploaded")
 
-                results.append(result)
+        results = [unchanged.get(shot.url, shot) for shot in captured]
 
         logger.info(f"Captured {len(results)}/{len(urls)} screenshots")
         return results
 
+    @staticmethod
+    def _png_digest(png_path: str) -> Optional[str]:
+        """
+        Hash a captured PNG so identical renders can be recognized.
+
+        Chromium's PNG encoding is deterministic, so equal pixels give equal bytes.
+
+        Args:
+            png_path: Path to the PNG screenshot
+
+        Returns:
+            Hex BLAKE2b digest, or None if the file can't be read
+        """
+        try:
+            return hashlib.blake2b(Path(png_path).read_bytes(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _encode_webp(png_path: str) -> Optional[str]:
+        """
+        Convert a PNG screenshot to lossy WebP next to it, removing the PNG.
+
+        Pillow releases the GIL while libwebp encodes, so this runs in threads
+        (Celery's prefork workers can't start a process pool).
+
+        Args:
+            png_path: Path to the PNG screenshot
+
+        Returns:
+            Path to the WebP file, or None if encoding failed (the PNG is kept)
+        """
+        webp_path = Path(png_path).with_suffix(".webp")
+        try:
+            with Image.open(png_path) as image:
+                image.save(webp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+        except Exception as e:
+            # e.g. full-page shots taller than WebP's 16383px limit
+            logger.warning(f"Keeping PNG for {png_path} - WebP encoding failed: {e}")
+            webp_path.unlink(missing_ok=True)
+            return None
+
+        Path(png_path).unlink(missing_ok=True)
+        return str(webp_path)
+
+    def _screenshot_target(self, url: str, prefix: str) -> Optional[tuple[str, str, str]]:
+        """
+        Validate a (warmed-up) URL and pick its screenshot filename.
+
+        Args:
+            url: URL to screenshot
+            prefix: Filename prefix (e.g., "before_" or "after_")
+
+        Returns:
+            (url, absolute_url, filename), or None if the URL is not accessible
+        """
+        # Convert relative URLs to absolute for validation
+        full_url = url
+        if url.startswith("/"):
+            if not self.dev_server_port:
+                logger.warning(f"Cannot validate relative URL {url} - dev server not running")
+                return None
+            full_url = f"http://localhost:{self.dev_server_port}{url}"
+
+        # Validate URL before screenshotting
+        if not self.validate_url(full_url):
+            logger.info(f"Skipping screenshot of {url} - URL not accessible")
+            return None
+
+        # Generate filename from URL
+        url_slug = url.strip("/").replace("/", "_").replace(":", "").replace("?", "_")[:50]
+        if not url_slug:
+            url_slug = "home"
+
+        return url, full_url, f"{prefix}{url_slug}.png"
+
+    async def _capture_screenshots_concurrently(
+        self,
+        urls: list[str],
+        prefix: str,
+        viewport_width: int = 1920,
+        viewport_height: int = 1080,
+        full_page: bool = True
+    ) -> tuple[list[tuple[str, str, str]], list[Optional[str]]]:
+        """
+        Warm up, validate, and capture several pages at once with one shared browser.
+
+        Each URL runs its own pipeline (warm up -> let compilation settle -> validate
+        -> capture), so a page that compiles quickly is captured while slower ones
+        are still compiling. On the first call Chromium launches alongside the
+        pipelines; later calls reuse the running browser. Each page gets its own
+        browser context; a semaphore caps how many render at the same time
+        (MAX_CONCURRENT_SCREENSHOTS).
+
+        Args:
+            urls: List of URLs to screenshot
+            prefix: Filename prefix (e.g., "before_" or "after_")
+            viewport_width: Browser viewport width
+            viewport_height: Browser viewport height
+            full_page: Capture full page or just viewport
+
+        Returns:
+            Tuple of ((url, absolute_url, filename) targets, screenshot path per
+            target with None where capture failed), in URL order
+        """
+        browser_launch = asyncio.create_task(self._get_browser())
+        semaphore = asyncio.Semaphore(max(1, min(MAX_CONCURRENT_SCREENSHOTS, len(urls))))
+
+        async def capture(url: str, full_url: str, filename: str) -> Optional[str]:
+            browser = await browser_launch
+            screenshot_path = self.screenshots_dir / filename
+            async with semaphore:
+                logger.info(f"Capturing screenshot: {full_url} -> {filename}")
+                # Fresh context per page so cookies/storage don't leak between pages or phases
+                context = await browser.new_context(
+                    viewport={'width': viewport_width, 'height': viewport_height}
+                )
+                try:
+                    page = await context.new_page()
+
+                    # Navigate with timeout
+                    await page.goto(full_url, wait_until='networkidle', timeout=30000)
+
+                    # Wait a bit for any animations/hydration
+                    await page.wait_for_timeout(2000)
+
+                    # Capture screenshot
+                    await page.screenshot(path=str(screenshot_path), full_page=full_page)
+
+                    logger.info(f"Screenshot saved: {screenshot_path}")
+                    return str(screenshot_path)
+
+                except Exception as e:
+                    logger.error(f"Failed to capture screenshot of {url}: {e}")
+                    return None
+                finally:
+                    await context.close()
+
+        async def pipeline(url: str) -> Optional[tuple[tuple[str, str, str], Optional[str]]]:
+            await asyncio.to_thread(self._warm_up_page, url)
+
+            # Give server a moment to finish any async compilation
+            await asyncio.sleep(PAGE_SETTLE_SECONDS)
+
+            target = await asyncio.to_thread(self._screenshot_target, url, prefix)
+            if target is None:
+                return None
+            return target, await capture(*target)
+
+        logger.info(f"Warming up {len(urls)} pages to trigger compilation (then {PAGE_SETTLE_SECONDS}s to settle)...")
+        try:
+            outcomes = [outcome for outcome in await asyncio.gather(*(pipeline(url) for url in urls)) if outcome]
+        finally:
+            # Settle the launch even if no page needed the browser (it's kept for later calls)
+            try:
+                await browser_launch
+            except Exception as e:
+                logger.debug(f"Screenshot browser launch failed: {e}")
+
+        return [target for target, _ in outcomes], [path for _, path in outcomes]
+
+    def _run_async(self, coro: Any) -> Any:
+        """
+        Run a coroutine on this instance's private event loop.
+
+        asyncio.run would create (and close) a new loop per call, taking the shared
+        browser down with it; a long-lived loop lets the before and after phases
+        reuse one browser.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result
+        """
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                # libuv-backed loop when available: cheaper I/O for many concurrent page connections
+                self._loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+            return self._loop.run_until_complete(coro)
+
+    def prewarm_browser(self) -> None:
+        """
+        Launch the shared screenshot browser ahead of time (e.g. from a worker thread).
+
+        Safe to call while a capture is running - it waits its turn on the shared
+        event loop. Failures are logged and left for the next capture to retry.
+        """
+        try:
+            self._run_async(self._get_browser())
+        except Exception as e:
+            logger.warning(f"Failed to prewarm screenshot browser: {e}")
+
+    async def _get_browser(self) -> Any:
+        """
+        Return the shared headless Chromium, launching it on first use.
+
+        Returns:
+            Connected Playwright Browser
+        """
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+        logger.info("Launching headless browser for screenshots...")
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        return self._browser
+
+    def close_browser(self) -> None:
+        """Close the shared browser, Playwright driver, and their event loop."""
+        async def close() -> None:
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                return
+            try:
+                self._loop.run_until_complete(close())
+            except Exception as e:
+                logger.warning(f"Error closing screenshot browser: {e}")
+            finally:
+                self._browser = None
+                self._playwright = None
+                self._loop.close()
+                self._loop = None
+
+    def urls_affected_by(self, urls: list[str], changed_files: list[str]) -> list[str]:
+        """
+        Filter page URLs down to those the changed files can affect.
+
+        Only page/layout files under a Next.js project's routing root (app/ or
+        pages/ next to next.config.*) narrow the set. Any other change - components,
+        styles, API routes, or a non-Next.js app - may reach every page, so all
+        URLs are kept.
+
+        Args:
+            urls: Page URLs that were screenshotted
+            changed_files: Paths relative to the repo root
+
+        Returns:
+            URLs (in input order) whose rendering may have changed
+        """
+        return affected_urls(urls, changed_files, next_routing_roots(self.repo_path))
+
     def extract_urls_from_plan(self, plan: str) -> list[str]:
         """
         Extract frontend page URLs from implementation plan.
@@ -781,8 +1136,6 @@ class ScreenshotTools:
         Returns:
             List of URLs to screenshot (defaults to ["/"] if none found)
         """
-        import re
-
         urls = []
 
         # Look for route patterns: /path, /path/subpath, etc.
@@ -840,4 +1193,9 @@ class ScreenshotTools:
 
     def cleanup(self) -> None:
         """Clean up resources."""
+        self.close_browser()
+        with self._http_lock:
+            if self._http_session is not None:
+                self._http_session.close()
+                self._http_session = None
         self.stop_dev_server()
@@ -1,5 +1,6 @@
 """Internet search tools for AI agents."""
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -188,6 +189,28 @@ class SearchTools:
 
         return "\n".join(context_parts)
 
+    async def search_with_context_async(
+        self,
+        query: str,
+        max_results: int = 5,
+        include_quick_answer: bool = True
+    ) -> str:
+        """
+        Async version of search_with_context.
+
+        The DuckDuckGo client is synchronous, so the search runs in a worker
+        thread; gather several of these to run independent queries concurrently.
+
+        Args:
+            query: Search query
+            max_results: Maximum search results (default: 5)
+            include_quick_answer: Try to get instant answer first (default: True)
+
+        Returns:
+            Formatted search context with optional quick answer and search results
+        """
+        return await asyncio.to_thread(self.search_with_context, query, max_results, include_quick_answer)
+
     def format_for_ai_context(
         self,
         searches: list[tuple[str, str]],
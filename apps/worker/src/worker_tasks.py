@@ -2,12 +2,20 @@
 
 from celery import Task
 from celery_app import app
+import base64
 import logging
+import re
+import shutil
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Any, List, Dict, Optional
 import os
 
+import pytz
+from slack_bolt import App
+
 # Add shared module to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "shared" / "src"))
 # Add orchestrator module to path (for dog_selector)
@@ -22,7 +30,7 @@ from slack_utils import (
     format_task_cancelled,
 )
 from repo_manager import RepoManager
-from dog import Dog
+from dog import Dog, strip_skip_cache_marker, truncate_title
 from dog_selector import DogSelector
 from cancellation import CancellationManager, TaskCancelled
 from dog_communication import DogCommunication
@@ -97,6 +105,9 @@ def run_coding_task(
     """
     logger.info(f"Worker executing task {task_id} as {dog_name}")
 
+    # The cache opt-out marker is an instruction to us, not part of the task
+    task_description, skip_cache = strip_skip_cache_marker(task_description)
+
     work_dir = Path(__file__).parent.parent.parent.parent / "workdir" / task_id
     slack_client = None
     pr_info = None
@@ -115,7 +126,6 @@ def run_coding_task(
 
     try:
         # Initialize Slack client (for posting updates)
-        from slack_bolt import App
         slack_app = App(token=config.slack_bot_token)
         slack_client = slack_app.client
 
@@ -160,8 +170,6 @@ def run_coding_task(
             images_dir = work_dir / ".dogwalker_images"
             images_dir.mkdir(exist_ok=True)
 
-            import base64
-            import re
             for i, img in enumerate(images):
                 filename = img.get("filename", f"image_{i}.png")
                 mimetype = img.get("mimetype", "image/png")
@@ -292,15 +300,13 @@ def run_coding_task(
             repo_path=work_dir,
             communication=communication,
             search_tools=search_tools,
-            screenshot_tools=screenshot_tools
+            screenshot_tools=screenshot_tools,
+            skip_cache=skip_cache
         )
 
-        logger.info("Generating concise PR title")
+        logger.info("Generating PR title, implementation plan, and search analysis concurrently")
         # Generate AI-created title (max 57 chars to leave room for "[Dogwalker] " prefix)
-        pr_title_text = dog.generate_pr_title(task_description, max_length=57)
-
-        logger.info("Generating implementation plan")
-        plan = dog.generate_plan(task_description)
+        pr_title_text, plan, search_queries = dog.prepare_task_artifacts(task_description, max_length=57)
 
         # Step 5: Create draft PR with plan
         logger.info("Creating draft PR with plan")
@@ -316,15 +322,12 @@ def run_coding_task(
             logger.warning(f"PR title exceeded max length ({len(pr_title)} > {MAX_TITLE_LENGTH}), truncating")
             # Emergency truncation at word boundary
             available = MAX_TITLE_LENGTH - len(PREFIX)
-            pr_title_text = pr_title_text[:available].rsplit(' ', 1)[0]
+            pr_title_text = truncate_title(pr_title_text, available)
             pr_title = f"{PREFIX}{pr_title_text}"
 
         logger.info(f"PR title: '{pr_title}' ({len(pr_title)}/{MAX_TITLE_LENGTH} chars)")
 
         # Format requester name with link
-        from datetime import datetime
-        import pytz
-
         local_tz = pytz.timezone('America/Los_Angeles')
         request_time = datetime.fromtimestamp(start_time, tz=pytz.UTC).astimezone(local_tz)
         request_time_str = request_time.strftime("%B %d, %Y at %I:%M:%S %p %Z")
@@ -387,7 +390,7 @@ def run_coding_task(
         if before_screenshots:
             logger.info(f"✅ Captured and uploaded {len(before_screenshots)} BEFORE screenshots to GitHub")
             for shot in before_screenshots:
-                logger.info(f"   - {shot['url']}: {shot.get('github_url', 'NO GITHUB URL')}")
+                logger.info(f"   - {shot.url}: {shot.github_url or 'NO GITHUB URL'}")
         else:
             logger.info("ℹ️  No before screenshots captured (not a frontend task or dev server failed)")
 
@@ -408,7 +411,8 @@ def run_coding_task(
         success = dog.run_task(
             full_task_description,
             image_files=image_files if image_files else None,
-            web_context=web_context
+            web_context=web_context,
+            search_queries=search_queries
         )
 
         if not success:
@@ -430,30 +434,19 @@ def run_coding_task(
 Please make these changes now."""
             dog.run_task(feedback_prompt, web_context=web_context, allow_no_changes=True)
 
-        # Step 8: Run self-review
-        logger.info("Running self-review on code changes")
-        dog.run_self_review()
-
-        # Checkpoint: Before testing phase
+        # Step 8-9: Run self-review and write/run comprehensive tests
+        # Both start from the implemented tree, so they run concurrently: tests are
+        # written and run in the repo itself (where dependencies are installed) while
+        # review works in a separate git worktree and is merged back afterwards.
+        # There is no longer a feedback check between them: feedback
+        # that arrives meanwhile is picked up by the final-feedback check below,
+        # which re-runs tests after applying it
+        logger.info("Running self-review and writing comprehensive tests")
+        test_success, test_message = dog.run_review_and_tests_concurrently()
+
+        # Checkpoint: After self-review and testing
         check_cancellation("self-review")
 
-        # Check for feedback after self-review
-        logger.info("Checking for any new feedback after self-review")
-        post_review_feedback = communication.check_for_feedback()
-        if post_review_feedback:
-            logger.info("Received feedback after self-review, incorporating before testing...")
-            communication.post_update("I've received your feedback and will incorporate it before writing tests! 👍")
-
-            # Run additional changes based on feedback
-            feedback_prompt = f"""{communication.format_feedback_for_prompt(post_review_feedback)}
-
-Please make these changes now."""
-            dog.run_task(feedback_prompt, web_context=web_context, allow_no_changes=True)
-
-        # Step 9: Write and run comprehensive tests
-        logger.info("Writing and running comprehensive tests")
-        test_success, test_message = dog.write_and_run_tests()
-
         if not test_success:
             raise ValueError(f"Tests failed: {test_message}")
 
@@ -487,7 +480,7 @@ Please make these changes now."""
             if after_screenshots:
                 logger.info(f"✅ Captured and uploaded {len(after_screenshots)} AFTER screenshots to GitHub")
                 for shot in after_screenshots:
-                    logger.info(f"   - {shot['url']}: {shot.get('github_url', 'NO GITHUB URL')}")
+                    logger.info(f"   - {shot.url}: {shot.github_url or 'NO GITHUB URL'}")
             else:
                 logger.error("❌ Failed to capture after screenshots (dev server failed or URLs not accessible)")
         else:
@@ -505,8 +498,7 @@ Please make these changes now."""
         # Step 11: Calculate duration and get modified files
         logger.info("Calculating task duration and collecting changes")
 
-        import time as time_module
-        end_time = time_module.time()
+        end_time = time.time()
         duration_seconds = end_time - start_time
 
         # Format duration
@@ -553,9 +545,9 @@ Max 3-5 bullet points."""
         logger.info(f"   - Before screenshots: {len(before_screenshots) if before_screenshots else 0}")
         logger.info(f"   - After screenshots: {len(after_screenshots) if after_screenshots else 0}")
         if before_screenshots:
-            logger.info(f"   - Before screenshots have GitHub URLs: {all(s.get('github_url') for s in before_screenshots)}")
+            logger.info(f"   - Before screenshots have GitHub URLs: {all(s.github_url for s in before_screenshots)}")
         if after_screenshots:
-            logger.info(f"   - After screenshots have GitHub URLs: {all(s.get('github_url') for s in after_screenshots)}")
+            logger.info(f"   - After screenshots have GitHub URLs: {all(s.github_url for s in after_screenshots)}")
 
         # Generate complete final PR description
         final_pr_body = dog.generate_final_pr_description(
@@ -583,8 +575,9 @@ Max 3-5 bullet points."""
         logger.info("Marking PR as ready for review")
         github_client.mark_pr_ready(pr_info["pr_number"])
 
-        # Step 14: Post completion to Slack
+        # Step 14: Post completion to Slack (after any queued progress updates)
         logger.info(f"Posting completion to Slack thread {thread_ts}")
+        communication.flush()
 
         slack_client.chat_postMessage(
             channel=channel_id,
@@ -628,15 +621,11 @@ Max 3-5 bullet points."""
                 logger.info("Updating PR with cancellation notice")
 
                 # Generate cancelled PR body
-                from datetime import datetime
-                import pytz
-
                 local_tz = pytz.timezone('America/Los_Angeles')
                 request_time = datetime.fromtimestamp(start_time, tz=pytz.UTC).astimezone(local_tz)
                 request_time_str = request_time.strftime("%B %d, %Y at %I:%M:%S %p %Z")
 
-                import time as time_module
-                cancel_time = time_module.time()
+                cancel_time = time.time()
                 duration_seconds = cancel_time - start_time
                 minutes = int(duration_seconds // 60)
                 seconds = int(duration_seconds % 60)
@@ -705,8 +694,10 @@ _Note: This is a partial implementation that was cancelled mid-execution._
                     body=cancelled_pr_body,
                 )
 
-            # Post cancellation message to Slack
+            # Post cancellation message to Slack (after any queued progress updates)
             if slack_client:
+                if 'communication' in locals():
+                    communication.flush()
                 slack_client.chat_postMessage(
                     channel=channel_id,
                     thread_ts=thread_ts,
@@ -738,9 +729,11 @@ _Note: This is a partial implementation that was cancelled mid-execution._
     except Exception as exc:
         logger.exception(f"Task {task_id} failed: {exc}")
 
-        # Post failure to Slack
+        # Post failure to Slack (after any queued progress updates)
         if slack_client:
             try:
+                if 'communication' in locals():
+                    communication.flush()
                 slack_client.chat_postMessage(
                     channel=channel_id,
                     thread_ts=thread_ts,
@@ -765,17 +758,16 @@ _Note: This is a partial implementation that was cancelled mid-execution._
         }
 
     finally:
-        # Stop dev server if it's running
+        # Stop dev server and screenshot browser if they're running
         try:
             if 'screenshot_tools' in locals():
-                logger.info("Stopping dev server (if running)...")
-                screenshot_tools.stop_dev_server()
+                logger.info("Stopping dev server and screenshot browser (if running)...")
+                screenshot_tools.cleanup()
         except Exception as e:
             logger.error(f"Failed to stop dev server: {e}")
 
         # Cleanup work directory
         if work_dir.exists():
-            import shutil
             try:
                 shutil.rmtree(work_dir)
                 logger.info(f"Cleaned up work directory {work_dir}")
@@ -0,0 +1,7 @@
+"""Make the worker modules importable the way the worker runs them (flat imports)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "shared" / "src"))
@@ -0,0 +1,147 @@
+"""Tests for Next.js route scoping of changed files."""
+
+import subprocess
+
+import pytest
+
+from next_routes import affected_urls, next_routing_roots, route_scope, url_in_route_scope
+
+
+@pytest.fixture
+def next_app(tmp_path):
+    """A Next.js project with an app/ router and a pages/ router."""
+    (tmp_path / "next.config.js").write_text("module.exports = {}\n")
+    (tmp_path / "app").mkdir()
+    (tmp_path / "pages").mkdir()
+    return tmp_path
+
+
+def test_routing_roots_require_next_config(tmp_path):
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "src" / "pages").mkdir(parents=True)
+    assert next_routing_roots(tmp_path) == []
+
+
+def test_routing_roots_at_project_root(next_app):
+    assert next_routing_roots(next_app) == ["app", "pages"]
+
+
+def test_routing_roots_fall_back_to_src(tmp_path):
+    (tmp_path / "next.config.mjs").write_text("export default {}\n")
+    (tmp_path / "src" / "app").mkdir(parents=True)
+    assert next_routing_roots(tmp_path) == ["src/app"]
+
+
+def test_routing_roots_in_monorepo_app(tmp_path):
+    web = tmp_path / "apps" / "web"
+    (web / "app").mkdir(parents=True)
+    (web / "next.config.ts").write_text("export default {}\n")
+    assert next_routing_roots(tmp_path) == ["apps/web/app"]
+
+
+def test_routing_roots_ignore_node_modules(tmp_path):
+    package = tmp_path / "node_modules" / "some-pkg"
+    (package / "pages").mkdir(parents=True)
+    (package / "next.config.js").write_text("")
+    assert next_routing_roots(tmp_path) == []
+
+
+@pytest.mark.parametrize("changed_file, expected", [
+    ("app/page.tsx", []),
+    ("app/blog/[slug]/page.tsx", ["blog", "[slug]"]),
+    ("app/(marketing)/about/layout.tsx", ["about"]),
+    ("app/@modal/settings/page.tsx", ["settings"]),
+    ("pages/index.tsx", []),
+    ("pages/dashboard.tsx", ["dashboard"]),
+    ("pages/blog/index.tsx", ["blog"]),
+])
+def test_route_scope_narrows_routing_files(changed_file, expected):
+    assert route_scope(changed_file, ["app", "pages"]) == expected
+
+
+@pytest.mark.parametrize("changed_file", [
+    "src/pages/Home.tsx",  # React Router app - no Next.js routing root
+    "src/components/pages/DashboardCard.tsx",  # Folder that happens to be named "pages"
+    "pages/api/stats.ts",  # API data feeds pages
+    "app/api/stats/route.ts",  # Route handlers feed pages
+    "app/dashboard/route.ts",
+    "app/dashboard/Chart.tsx",  # Colocated module, may be imported anywhere
+    "pages/_app.tsx",
+    "pages/_document.tsx",
+    "app/_internal/page.tsx",  # Private folder
+    "app/(.)photo/page.tsx",  # Intercepting route
+    "components/Header.tsx",
+    "styles/globals.css",
+])
+def test_route_scope_is_unbounded_for_other_files(changed_file):
+    assert route_scope(changed_file, ["app", "pages"]) is None
+
+
+def test_route_scope_without_routing_roots():
+    assert route_scope("pages/dashboard.tsx", []) is None
+
+
+@pytest.mark.parametrize("url, scope, expected", [
+    ("/", [], True),
+    ("/dashboard", [], True),
+    ("/dashboard", ["dashboard"], True),
+    ("/dashboard/settings", ["dashboard"], True),
+    ("/", ["dashboard"], False),
+    ("/blog", ["dashboard"], False),
+    ("/blog/hello", ["blog", "[slug]"], True),
+    ("/blog", ["blog", "[slug]"], False),
+    ("/docs/a/b/c", ["docs", "[...path]"], True),
+    ("/docs", ["docs", "[[...path]]"], True),
+    ("http://localhost:3000/dashboard?tab=1", ["dashboard"], True),
+])
+def test_url_in_route_scope(url, scope, expected):
+    assert url_in_route_scope(url, scope) is expected
+
+
+URLS = ["/", "/blog/hello", "/dashboard"]
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, encoding="utf-8"
+    ).stdout
+
+
+def test_affected_urls_ignore_untracked_before_shots(next_app):
+    """The before screenshots sit untracked in the work tree next to the real change."""
+    (next_app / "app" / "blog" / "[slug]").mkdir(parents=True)
+    (next_app / "app" / "blog" / "[slug]" / "page.tsx").write_text("export default 1\n")
+    _git(next_app, "init", "-q")
+    _git(next_app, "add", "-A")
+    _git(next_app, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+    before_head = _git(next_app, "rev-parse", "HEAD").strip()
+
+    (next_app / ".dogwalker_screenshots").mkdir()
+    (next_app / ".dogwalker_screenshots" / "before_blog_hello.png").write_bytes(b"png")
+    (next_app / ".dogwalker_images").mkdir()
+    (next_app / ".dogwalker_images" / "mockup.png").write_bytes(b"png")
+    (next_app / "app" / "blog" / "[slug]" / "page.tsx").write_text("export default 2\n")
+
+    # Same listing as Dog._files_changed_since
+    changed = (
+        _git(next_app, "diff", "--name-only", before_head, "--").splitlines()
+        + _git(next_app, "ls-files", "--others", "--exclude-standard").splitlines()
+    )
+    assert ".dogwalker_screenshots/before_blog_hello.png" in changed
+
+    assert affected_urls(URLS, changed, next_routing_roots(next_app)) == ["/blog/hello"]
+
+
+@pytest.mark.parametrize("changed_files, expected", [
+    (["pages/dashboard.tsx", "pages/dashboard.test.tsx"], ["/dashboard"]),
+    (["pages/dashboard.tsx", "__tests__/home.tsx"], ["/dashboard"]),
+    (["pages/dashboard.tsx", "content/posts/hello.md"], URLS),  # Markdown content renders
+    (["pages/dashboard.tsx", "components/Header.tsx"], URLS),
+    ([], []),
+])
+def test_affected_urls(changed_files, expected):
+    assert affected_urls(URLS, changed_files, ["app", "pages"]) == expected
+
+
+def test_affected_urls_without_routing_roots():
+    assert affected_urls(URLS, ["pages/dashboard.tsx"], []) == URLS
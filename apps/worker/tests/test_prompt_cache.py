@@ -0,0 +1,98 @@
+"""Tests for the on-disk LLM response caches."""
+
+import pytest
+
+from prompt_cache import PromptCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A PromptCache backed by a temporary database."""
+    return PromptCache(tmp_path / "llm.db")
+
+
+def test_similarity_ignores_case_and_punctuation():
+    assert PromptCache.similarity("Add a dark-mode toggle.", "add a DARK mode toggle") == 1.0
+
+
+def test_similarity_of_disjoint_and_empty_texts():
+    assert PromptCache.similarity("fix login", "update docs") == 0.0
+    assert PromptCache.similarity("", "update docs") == 0.0
+
+
+def test_find_similar_returns_best_match_for_template(cache):
+    cache.put_similar("pr_title:57", "Add dark mode toggle to settings", "Add dark mode toggle")
+    cache.put_similar("pr_title:57", "Fix login redirect loop", "Fix login redirect loop")
+    cache.put_similar("pr_title:40", "Add dark mode toggle to the settings page", "Other length")
+
+    score, text, response = cache.find_similar("pr_title:57", "Add a dark mode toggle to the settings page")
+
+    assert text == "Add dark mode toggle to settings"
+    assert response == "Add dark mode toggle"
+    assert 0.6 < score < 1.0
+
+
+def test_find_similar_with_nothing_stored(cache):
+    assert cache.find_similar("pr_title:57", "Anything") is None
+
+
+def test_find_similar_treats_database_errors_as_a_miss(cache):
+    cache.put_similar("pr_title:57", "Fix login", "Fix login")
+    cache._conn.close()
+
+    assert cache.find_similar("pr_title:57", "Fix login") is None
+
+
+def test_put_similar_swallows_database_errors(cache):
+    cache._conn.close()
+
+    cache.put_similar("pr_title:57", "Fix login", "Fix login")  # Must not raise
+
+
+def test_get_returns_stored_response(cache):
+    key = PromptCache.make_key("claude-sonnet-4-20250514", "Say hi", 100)
+    cache.put(key, "claude-sonnet-4-20250514", "Hi", 5, 2)
+
+    assert cache.get(key) == ("Hi", 5, 2)
+
+
+def test_get_miss(cache):
+    assert cache.get(PromptCache.make_key("claude-sonnet-4-20250514", "Say hi", 100)) is None
+
+
+def test_put_replaces_existing_entry(cache):
+    key = PromptCache.make_key("claude-sonnet-4-20250514", "Say hi", 100)
+    cache.put(key, "claude-sonnet-4-20250514", "Hi", 5, 2)
+    cache.put(key, "claude-sonnet-4-20250514", "Hello", 5, 3)
+
+    assert cache.get(key).response == "Hello"
+
+
+def test_make_key_depends_on_output_affecting_params():
+    base = PromptCache.make_key("claude-sonnet-4-20250514", "Say hi", 100)
+
+    assert base == PromptCache.make_key("claude-sonnet-4-20250514", "Say hi", 100)
+    assert base != PromptCache.make_key("claude-3-5-haiku-20241022", "Say hi", 100)
+    assert base != PromptCache.make_key("claude-sonnet-4-20250514", "Say hi", 200)
+    assert base != PromptCache.make_key("claude-sonnet-4-20250514", "Say hi", 100, stop_sequences=["\n"])
+
+
+def test_cache_persists_across_instances(tmp_path):
+    key = PromptCache.make_key("claude-sonnet-4-20250514", "Say hi", 100)
+    PromptCache(tmp_path / "llm.db").put(key, "claude-sonnet-4-20250514", "Hi", 5, 2)
+
+    assert PromptCache(tmp_path / "llm.db").get(key).response == "Hi"
+
+
+def test_get_treats_database_errors_as_a_miss(cache):
+    key = PromptCache.make_key("claude-sonnet-4-20250514", "Say hi", 100)
+    cache.put(key, "claude-sonnet-4-20250514", "Hi", 5, 2)
+    cache._conn.close()
+
+    assert cache.get(key) is None
+
+
+def test_put_swallows_database_errors(cache):
+    cache._conn.close()
+
+    cache.put("key", "claude-sonnet-4-20250514", "Hi", 5, 2)  # Must not raise